@@ -294,11 +294,15 @@ module.exports = class Exchange {
 
     defineRestApi (api, methodName, options = {}) {
 
+        this.endpoints = {} // type + method + path -> rate limiter cost
+
         for (const type of Object.keys (api)) {
             for (const httpMethod of Object.keys (api[type])) {
 
-                let paths = api[type][httpMethod]
+                // paths are either an array or an object of path -> rate limiter cost
+                let paths = Array.isArray (api[type][httpMethod]) ? api[type][httpMethod] : Object.keys (api[type][httpMethod])
                 for (let i = 0; i < paths.length; i++) {
+                    let cost = Array.isArray (api[type][httpMethod]) ? undefined : api[type][httpMethod][paths[i]]
                     let path = paths[i].trim ()
                     let splitPath = path.split (/[^a-zA-Z0-9]/)
 
@@ -323,6 +327,9 @@ module.exports = class Exchange {
                     if ('camelcase_suffix' in options)
                         camelcase += options.camelcaseSuffix;
 
+                    if (cost !== undefined)
+                        this.endpoints[type + ' ' + uppercaseMethod + ' ' + path] = cost
+
                     let partial = async params => this[methodName] (path, type, uppercaseMethod, params || {})
 
                     this[camelcase]  = partial
@@ -364,10 +371,30 @@ module.exports = class Exchange {
         return this.executeRestRequest (url, method, headers, body)
     }
 
+    calculateRateLimiterCost (type, method, path, params) {
+        // the cost of an endpoint as declared in describe ()['api'], undefined for the default cost
+        let config = this.endpoints ? this.endpoints[type + ' ' + method + ' ' + path] : undefined
+        if ((config === undefined) || (typeof config === 'number'))
+            return config
+        let cost = config['cost']
+        if (('noSymbol' in config) && !('symbol' in params))
+            cost = config['noSymbol']
+        if (('byLimit' in config) && ('limit' in params)) {
+            let limit = parseFloat (params['limit'])
+            for (const [ maxLimit, limitCost ] of config['byLimit']) {
+                if (limit <= maxLimit) {
+                    cost = limitCost
+                    break
+                }
+            }
+        }
+        return cost
+    }
+
     async fetch2 (path, type = 'public', method = 'GET', params = {}, headers = undefined, body = undefined) {
 
         if (this.enableRateLimit)
-            await this.throttle ()
+            await this.throttle (this.calculateRateLimiterCost (type, method, path, params))
 
         let request = this.sign (path, type, method, params, headers, body)
         return this.fetch (request.url, request.method, request.headers, request.body)
@@ -619,6 +619,8 @@ abstract class Exchange {
         );
 
         $this->lastRestRequestTimestamp = 0;
+        $this->lastRestRequestCost      = 0; // the rate limiter cost of the last request, paid by the next one
+        $this->endpoints                = array (); // api type, method and path -> rate limiter cost
         $this->lastRestPollTimestamp    = 0;
         $this->restRequestQueue         = null;
         $this->restPollerLoopIsRunning  = false;
@@ -645,7 +647,13 @@ abstract class Exchange {
     public function define_rest_api ($api, $method_name, $options = array ()) {
         foreach ($api as $type => $methods)
             foreach ($methods as $http_method => $paths)
-                foreach ($paths as $path) {
+                // paths are either a list or an associative array of path -> rate limiter cost
+                foreach ($paths as $key => $value) {
+
+                    $path = is_string ($key) ? $key : $value;
+
+                    if (is_string ($key))
+                        $this->endpoints[$type . ' ' . mb_strtoupper ($http_method) . ' ' . $path] = $value;
 
                     $splitPath = mb_split ('[^a-zA-Z0-9]', $path);
 
@@ -713,13 +721,37 @@ abstract class Exchange {
     }
 
     // this method is experimental
-    public function throttle () {
+    public function throttle ($cost = null) {
+        // the cost is paid after the request, the next request waits for as long as the previous one costs
         $now = $this->milliseconds ();
         $elapsed = $now - $this->lastRestRequestTimestamp;
-        if ($elapsed < $this->rateLimit) {
-            $delay = $this->rateLimit - $elapsed;
+        $interval = $this->rateLimit * $this->lastRestRequestCost;
+        if ($elapsed < $interval) {
+            $delay = $interval - $elapsed;
               usleep ((int)($delay * 1000.0));
         }
+        $this->lastRestRequestCost = ($cost === null) ? $this->tokenBucket['defaultCost'] : $cost;
+    }
+
+    public function calculate_rate_limiter_cost ($api, $method, $path, $params) {
+        // the cost of an endpoint as declared in describe ()['api'], null for the default cost
+        $key = $api . ' ' . $method . ' ' . $path;
+        $config = array_key_exists ($key, $this->endpoints) ? $this->endpoints[$key] : null;
+        if (($config === null) || is_numeric ($config))
+            return $config;
+        $cost = array_key_exists ('cost', $config) ? $config['cost'] : null;
+        if (array_key_exists ('noSymbol', $config) && !array_key_exists ('symbol', $params))
+            $cost = $config['noSymbol'];
+        if (array_key_exists ('byLimit', $config) && array_key_exists ('limit', $params)) {
+            $limit = floatval ($params['limit']);
+            foreach ($config['byLimit'] as $entry) {
+                if ($limit <= $entry[0]) {
+                    $cost = $entry[1];
+                    break;
+                }
+            }
+        }
+        return $cost;
     }
 
     public function sign($path, $api = 'public', $method = 'GET', $params = array (), $headers = null, $body = null) {
@@ -727,6 +759,8 @@ abstract class Exchange {
     }
 
     public function fetch2 ($path, $api = 'public', $method = 'GET', $params = array (), $headers = null, $body = null) {
+        if ($this->enableRateLimit)
+            $this->throttle ($this->calculate_rate_limiter_cost ($api, $method, $path, $params));
         $request = $this->sign ($path, $api, $method, $params, $headers, $body);
         return $this->fetch ($request['url'], $request['method'], $request['headers'], $request['body']);
     }
@@ -741,9 +775,6 @@ abstract class Exchange {
 
     public function fetch ($url, $method = 'GET', $headers = null, $body = null) {
 
-        if ($this->enableRateLimit)
-            $this->throttle ();
-
         $headers = array_merge ($this->headers, $headers ? $headers : array ());
 
         if (strlen ($this->proxy))
@@ -12,7 +12,13 @@ class binance extends Exchange {
             'id' => 'binance',
             'name' => 'Binance',
             'countries' => 'JP', // Japan
-            'rateLimit' => 500,
+            'rateLimit' => 50, // milliseconds per unit of request weight, 1200 per minute
+            // the request weight used in the current minute, of 1200
+            'rateLimitHeaders' => array (
+                'used' => 'X-MBX-USED-WEIGHT',
+                'limit' => 1200,
+                'interval' => 60000,
+            ),
             // new metainfo interface
             'has' => array (
                 'fetchDepositAddress' => true,
@@ -87,26 +93,26 @@ class binance extends Exchange {
                 ),
                 'public' => array (
                     'get' => array (
-                        'exchangeInfo',
-                        'ping',
-                        'time',
-                        'depth',
-                        'aggTrades',
-                        'klines',
-                        'ticker/24hr',
-                        'ticker/allPrices',
-                        'ticker/allBookTickers',
-                        'ticker/price',
-                        'ticker/bookTicker',
+                        'exchangeInfo' => 1,
+                        'ping' => 1,
+                        'time' => 1,
+                        'depth' => array ( 'cost' => 1, 'byLimit' => array ( array ( 100, 1 ), array ( 500, 5 ), array ( 1000, 10 ) ) ),
+                        'aggTrades' => 1,
+                        'klines' => 1,
+                        'ticker/24hr' => array ( 'cost' => 1, 'noSymbol' => 40 ),
+                        'ticker/allPrices' => 1,
+                        'ticker/allBookTickers' => 1,
+                        'ticker/price' => 1,
+                        'ticker/bookTicker' => 1,
                     ),
                 ),
                 'private' => array (
                     'get' => array (
-                        'order',
-                        'openOrders',
-                        'allOrders',
-                        'account',
-                        'myTrades',
+                        'order' => 1,
+                        'openOrders' => array ( 'cost' => 1, 'noSymbol' => 40 ),
+                        'allOrders' => 5,
+                        'account' => 5,
+                        'myTrades' => 5,
                     ),
                     'post' => array (
                         'order',
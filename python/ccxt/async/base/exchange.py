@@ -13,16 +13,16 @@ import time
 import math
 import random
 import string
-import certifi
 import aiohttp
-import ssl
 
 # -----------------------------------------------------------------------------
 
 from ccxt.async.base.throttle import throttle
+from ccxt.async.base.session_pool import create_session
 
 # -----------------------------------------------------------------------------
 
+from ccxt.base.errors import BaseError
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import RequestTimeout
 from ccxt.base.errors import DDoSProtection
@@ -30,6 +30,7 @@ from ccxt.base.errors import DDoSProtection
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange
+from ccxt.base.market_cache import MarketCache
 
 # -----------------------------------------------------------------------------
 
@@ -43,22 +44,52 @@ __all__ = [
 
 class Exchange(BaseExchange):
 
+    session_pool = None  # a SessionPool to share the session with other exchanges, each one has its own if not set
+    enableRequestCoalescing = True  # identical public requests in flight share one round trip
+    pending_requests = None
+    markets_loading = None
+
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
             self.asyncio_loop = config['asyncio_loop']
         self.asyncio_loop = self.asyncio_loop or asyncio.get_event_loop()
-        if 'session' not in config:
-            # Create out SSL context object with our CA cert file
-            context = ssl.create_default_context(cafile=certifi.where())
-            # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl_context=context, loop=self.asyncio_loop)
-            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector)
+        if 'session_pool' in config:
+            self.session_pool = config['session_pool']
+        self.own_session = 'session' not in config
+        if self.own_session:
+            if self.session_pool:
+                # share the connections and the DNS cache with the other exchanges of the pool
+                self.session = self.session_pool.acquire(self.asyncio_loop)
+            else:
+                self.session = create_session(self.asyncio_loop)
         super(Exchange, self).__init__(config)
         self.init_rest_rate_limiter()
+        self.pending_requests = {}
+
+    def __del__(self):
+        # the aiohttp session is closed by close(), it cannot be closed synchronously
+        pass
+
+    async def close(self):
+        """Close the session or release the pooled one, a session passed in the config is left to its owner"""
+        if (self.session is not None) and self.own_session:
+            if self.session_pool:
+                await self.session_pool.release(self.session)
+            else:
+                await self.session.close()
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     def init_rest_rate_limiter(self):
         self.throttle = throttle(self.extend({
             'loop': self.asyncio_loop,
+            'budget': self.rate_limit_budget,
+            'shared': self.sharedRateLimiter,
         }, self.tokenBucket))
 
     async def wait_for_token(self):
@@ -82,12 +113,102 @@ class Exchange(BaseExchange):
             self.rateLimitUpdateTime = now
 
     async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
-        """A better wrapper over request for deferred signing"""
+        """A better wrapper over request for deferred signing, retrying the transient errors"""
+        policy = self.retry_policy(api, method, path)
+        if not policy:
+            return await self.fetch_once(path, api, method, params, headers, body)
+        self.retry_stats['requests'] += 1
+        start = self.milliseconds()
+        retries = 0
+        delay = policy['baseDelay']
+        while True:
+            try:
+                # every attempt is signed again and waits for its turn in the rate limiter
+                response = await self.fetch_once(path, api, method, params, headers, body)
+                break
+            except BaseError as e:
+                delay = self.retry_delay(policy, retries, delay, e, self.milliseconds() - start)
+                if delay is None:
+                    self.retry_stats['failed'] += 1
+                    self.retry_stats['latency'] += self.milliseconds() - start
+                    raise
+                if self.verbose:
+                    print(self.id, method, path, 'retrying in', int(delay), 'ms after', type(e).__name__)
+                retries += 1
+                self.retry_stats['retries'] += 1
+                self.retry_stats['backoff'] += delay
+                await asyncio.sleep(delay / 1000.0)
+        if retries:
+            self.retry_stats['recovered'] += 1
+        self.retry_stats['latency'] += self.milliseconds() - start
+        return response
+
+    async def fetch_once(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        cost = self.calculate_rate_limiter_cost(api, method, path, params)
+        ttl = self.response_cache_ttl(api, method, path)
+        coalesce = self.enableRequestCoalescing and (api == 'public')
+        if ttl or coalesce:
+            # these requests are signed upfront to find a cached or an identical one in flight
+            request = self.sign(path, api, method, params, headers, body)
+            key = (request['method'], request['url'], request['body'])
+            if ttl:
+                cached = self.responseCache.get(key)
+                if cached is not None:
+                    return self.unjson(cached)
+            if not coalesce:
+                return await self.fetch_request(request, cost, ttl)
+            if key not in self.pending_requests:
+                future = asyncio.ensure_future(self.fetch_request(request, cost, ttl), loop=self.asyncio_loop)
+                future.add_done_callback(lambda _: self.pending_requests.pop(key, None))
+                self.pending_requests[key] = future
+            # a cancelled caller must not cancel the request for the others
+            return await asyncio.shield(self.pending_requests[key])
         if self.enableRateLimit:
-            await self.throttle()
+            await self.throttle(cost)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        return await self.send_request(request, cost)
+
+    async def fetch_request(self, request, cost=None, ttl=None):
+        """Throttle and perform a request that is already signed, caching the response for ttl milliseconds"""
+        if self.enableRateLimit:
+            await self.throttle(cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        response = await self.send_request(request, cost)
+        if ttl:
+            self.responseCache.set((request['method'], request['url'], request['body']), self.json(response), ttl)
+        return response
+
+    async def send_request(self, request, cost=None):
+        """Perform a signed request, adapting the rate limit to the pushback of the exchange"""
+        adaptive = self.adaptiveRateLimit['enabled']
+        try:
+            response = await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except BaseError as e:
+            if adaptive:
+                retry_after = self.retry_after(self.last_response_headers)
+                if isinstance(e, DDoSProtection) or (retry_after is not None):
+                    self.decrease_rate_limit(retry_after)
+            raise
+        finally:
+            if self.rate_limit_budget:
+                # the headers count the request itself, not the others still in flight
+                self.rate_limit_budget.release(self.tokenBucket['defaultCost'] if cost is None else cost)
+                self.rate_limit_budget.update(self.last_response_headers)
+        if adaptive:
+            self.increase_rate_limit()
+        return response
+
+    def update_rate_limiter(self, pause=None):
+        """Apply the adapted rate to the token bucket, a pause is a debt of tokens paid off by waiting"""
+        if self.rate_limit_budget:
+            self.rate_limit_budget.burst = self.rateLimitFactor >= 1.0
+        bucket = self.throttle.config
+        bucket['refillRate'] = self.tokenBucket['refillRate'] * self.rateLimitFactor
+        if pause:
+            bucket['numTokens'] = min(bucket['numTokens'], -pause * bucket['refillRate'])
+            if self.sharedRateLimiter:
+                self.sharedRateLimiter.pause(pause)
 
     async def fetch(self, url, method='GET', headers=None, body=None, proxy=''):
         """Perform a HTTP request and return decoded JSON data"""
@@ -101,11 +222,24 @@ class Exchange(BaseExchange):
         encoded_body = body.encode() if body else None
         session_method = getattr(self.session, method.lower())
         http_status_code = None
+        response_headers = None
+        self.last_response_headers = None
 
         try:
             async with session_method(url, data=encoded_body, headers=headers, timeout=(self.timeout / 1000), proxy=self.aiohttp_proxy) as response:
                 http_status_code = response.status
-                text = await response.text()
+                response_headers = self.last_response_headers = response.headers
+                # utf-8 json is decoded from the bytes, the text is only used for the error handling
+                raw = await response.read()
+                charset = (response.charset or 'utf-8').lower()
+                if charset not in ('utf-8', 'utf8'):
+                    try:
+                        text = raw.decode(charset, 'replace')
+                        raw = None  # the decoder gets the text in the charset of the response
+                    except LookupError:
+                        text = raw.decode('utf-8', 'replace')
+                else:
+                    text = raw.decode('utf-8', 'replace')
                 self.last_http_response = text
                 self.handle_errors(http_status_code, text, url, method, None, text)
                 self.handle_rest_errors(None, http_status_code, text, url, method)
@@ -122,11 +256,15 @@ class Exchange(BaseExchange):
         except aiohttp.client_exceptions.ClientConnectorError as e:
             self.raise_error(ExchangeError, url, method, e, None)
 
+        finally:
+            # the concurrent requests set them too while this one awaited the response
+            self.last_response_headers = response_headers
+
         if self.verbose:
             print(method, url, "\nResponse:", headers, text)
 
         self.handle_errors(http_status_code, text, url, method, None, text)
-        return self.handle_rest_response(text, url, method, headers, body)
+        return self.handle_rest_response(text, url, method, headers, body, raw)
 
     async def load_markets(self, reload=False):
         if not reload:
@@ -134,11 +272,46 @@ class Exchange(BaseExchange):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
-        markets = await self.fetch_markets()
-        currencies = None
-        if self.has['fetchCurrencies']:
-            currencies = await self.fetch_currencies()
-        return self.set_markets(markets, currencies)
+            if self.marketsCache['enabled']:
+                markets = self.load_cached_markets()
+                if markets is not None:
+                    return markets
+        # concurrent callers wait for the same load instead of fetching the markets again
+        if self.markets_loading is None:
+            self.markets_loading = asyncio.ensure_future(self.load_markets_helper(), loop=self.asyncio_loop)
+        return await asyncio.shield(self.markets_loading)
+
+    async def load_markets_helper(self):
+        try:
+            markets = await self.fetch_markets()
+            currencies = None
+            if self.has['fetchCurrencies']:
+                currencies = await self.fetch_currencies()
+            if self.marketsCache['enabled']:
+                self.get_markets_cache().save(markets, currencies)
+            return self.set_markets(markets, currencies)
+        finally:
+            self.markets_loading = None
+
+    def load_cached_markets(self):
+        """Set the markets from the local cache, refreshing an expired cache in a task of the event loop"""
+        cached = self.get_markets_cache().load()
+        if cached is None:
+            return None
+        markets = self.set_markets(cached['markets'], cached['currencies'])
+        if MarketCache.is_expired(cached, self.marketsCache['maxAge']):
+            self.refresh_cached_markets()
+        return markets
+
+    def refresh_cached_markets(self):
+        async def refresh():
+            try:
+                await self.load_markets(True)
+            except BaseError as e:
+                # the cached markets stay in use until the next refresh
+                if self.verbose:
+                    print(self.id, 'markets cache refresh failed:', str(e))
+        asyncio.ensure_future(refresh(), loop=self.asyncio_loop)
 
     async def fetch_markets(self):
         return self.markets
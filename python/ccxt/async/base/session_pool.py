@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import ssl
+import certifi
+import aiohttp
+
+__all__ = [
+    'SessionPool',
+    'create_session',
+    'default_session_pool',
+    'ssl_context',
+]
+
+# -----------------------------------------------------------------------------
+
+_ssl_context = None
+_default_session_pool = None
+
+
+def ssl_context():
+    """The SSL context with the certifi CA bundle, loaded once per process"""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return _ssl_context
+
+
+def create_session(loop, limit=100, limit_per_host=0, dns_cache_ttl=300, keepalive_timeout=30):
+    """An aiohttp session with the shared SSL context, 0 is no limit"""
+    connector = aiohttp.TCPConnector(
+        ssl_context=ssl_context(),
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        keepalive_timeout=keepalive_timeout,
+        loop=loop)
+    return aiohttp.ClientSession(loop=loop, connector=connector)
+
+
+def default_session_pool():
+    """A process-wide pool, exchanges share it when it is passed as their session_pool"""
+    global _default_session_pool
+    if _default_session_pool is None:
+        _default_session_pool = SessionPool()
+    return _default_session_pool
+
+# -----------------------------------------------------------------------------
+
+
+class SessionPool(object):
+    """A pool of aiohttp sessions shared by async exchange instances, one per event loop
+
+        pool = SessionPool()
+        exchanges = [ccxt.binance({'session_pool': pool}), ccxt.kraken({'session_pool': pool})]
+
+    The session is closed when the last of its exchanges is closed with exchange.close(),
+    exchange.session.close() would close it for every exchange of the pool.
+    The connections are limited in total, so the busiest exchanges queue for them.
+    """
+
+    limit = 100               # simultaneous connections in total, 0 for no limit
+    limitPerHost = 0          # simultaneous connections to a single host, 0 for no limit
+    dnsCacheTTL = 300         # seconds
+    keepaliveTimeout = 30     # seconds
+
+    def __init__(self, config={}):
+        for key in config:
+            setattr(self, key, config[key])
+        self.sessions = {}  # event loop -> [session, number of exchanges using it]
+
+    def create_session(self, loop):
+        return create_session(loop, self.limit, self.limitPerHost, self.dnsCacheTTL, self.keepaliveTimeout)
+
+    def acquire(self, loop):
+        entry = self.sessions.get(loop)
+        if (entry is None) or entry[0].closed:
+            entry = self.sessions[loop] = [self.create_session(loop), 0]
+        entry[1] += 1
+        return entry[0]
+
+    async def release(self, session):
+        for loop, entry in list(self.sessions.items()):
+            if entry[0] is session:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self.sessions[loop]
+                    await session.close()
+
+    async def close(self):
+        sessions = [session for session, _ in self.sessions.values()]
+        self.sessions = {}
+        for session in sessions:
+            await session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
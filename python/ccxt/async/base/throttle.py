@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import Queue, sleep, Future, ensure_future, get_event_loop
-from time import time
+from asyncio import sleep, Future, ensure_future, get_event_loop
+from collections import deque
 
 __all__ = [
     'throttle',
@@ -11,42 +11,68 @@ __all__ = [
 def throttle(config=None):
 
     cfg = {
-        'lastTimestamp': time(),
         'numTokens': 0,
         'running': False,
-        'queue': Queue(),
+        'queue': deque(),
         'loop': get_event_loop(),
-        'delay': 0.001,
         'refillRate': 0.001,
         'defaultCost': 1.000,
         'capacity': 1.000,
         'maxCapacity': 100,
+        'budget': None,  # a RateLimitBudget that lets requests through in bursts or holds them back
+        'shared': None,  # a SharedTokenBucket that takes the place of the tokens of this process
     }
 
-    cfg.update(config)
+    cfg.update(config or {})
+    cfg['lastTimestamp'] = cfg['loop'].time()
+
+    def refill():
+        now = cfg['loop'].time()
+        elapsed = now - cfg['lastTimestamp']
+        cfg['lastTimestamp'] = now
+        cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
 
     async def run():
-        # print('Refill Rate: {0}'.format(cfg['refillRate'] * 1000))
-        if not cfg['running']:
-            cfg['running'] = True
-            while not cfg['queue'].empty():
-                now = time()
-                elapsed = (now - cfg['lastTimestamp'])
-                cfg['lastTimestamp'] = now
-                cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
-                if cfg['numTokens'] > 0:
-                    if not cfg['queue'].empty():
-                        cost, future = cfg['queue'].get_nowait()
-                        cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
-                        if not future.done():
-                            future.set_result(None)
-                await sleep(cfg['delay'])
+        # a single drain task per bucket, alive for as long as there are waiters
+        # the tokens are allowed to go negative, the debt is paid off by sleeping
+        # exactly as long as it takes to refill it, instead of polling the bucket
+        try:
+            while cfg['queue']:
+                cost, future = cfg['queue'][0]
+                if future.done():  # the waiter was cancelled, it does not pay
+                    cfg['queue'].popleft()
+                    continue
+                refill()
+                budget = cfg['budget']
+                delay = budget.delay(cost) if budget else None
+                if delay:
+                    await sleep(delay / 1000)
+                elif (delay == 0) or cfg['shared'] or (cfg['numTokens'] >= 0):
+                    cfg['queue'].popleft()
+                    if delay is None:
+                        if cfg['shared']:
+                            # the turn is reserved among all processes, the next waiters queue behind it
+                            wait = cfg['shared'].acquire(cost, 1 / cfg['refillRate'], cfg['capacity'])
+                            if wait > 0:
+                                await sleep(wait / 1000)
+                        else:
+                            cfg['numTokens'] -= cost
+                    if budget:
+                        budget.spend(cost)
+                    if not future.done():
+                        future.set_result(None)
+                else:
+                    await sleep(-cfg['numTokens'] / (cfg['refillRate'] * 1000))
+        finally:
             cfg['running'] = False
 
     def throttle(cost=None):
-        future = Future()
-        cfg['queue'].put_nowait((cost, future))
-        ensure_future(run())
+        future = Future(loop=cfg['loop'])
+        cfg['queue'].append((cfg['defaultCost'] if cost is None else cost, future))
+        if not cfg['running']:
+            cfg['running'] = True
+            ensure_future(run(), loop=cfg['loop'])
         return future
 
+    throttle.config = cfg  # the bucket, adjusted in place by the adaptive rate limit
     return throttle
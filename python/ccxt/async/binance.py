@@ -27,7 +27,13 @@ class binance (Exchange):
             'id': 'binance',
             'name': 'Binance',
             'countries': 'JP',  # Japan
-            'rateLimit': 500,
+            'rateLimit': 50,  # milliseconds per unit of request weight, 1200 per minute
+            # the request weight used in the current minute, of 1200
+            'rateLimitHeaders': {
+                'used': 'X-MBX-USED-WEIGHT',
+                'limit': 1200,
+                'interval': 60000,
+            },
             # new metainfo interface
             'has': {
                 'fetchDepositAddress': True,
@@ -101,28 +107,28 @@ class binance (Exchange):
                     ],
                 },
                 'public': {
-                    'get': [
-                        'exchangeInfo',
-                        'ping',
-                        'time',
-                        'depth',
-                        'aggTrades',
-                        'klines',
-                        'ticker/24hr',
-                        'ticker/allPrices',
-                        'ticker/allBookTickers',
-                        'ticker/price',
-                        'ticker/bookTicker',
-                    ],
+                    'get': {
+                        'exchangeInfo': 1,
+                        'ping': 1,
+                        'time': 1,
+                        'depth': {'cost': 1, 'byLimit': [[100, 1], [500, 5], [1000, 10]]},
+                        'aggTrades': 1,
+                        'klines': 1,
+                        'ticker/24hr': {'cost': 1, 'noSymbol': 40},
+                        'ticker/allPrices': 1,
+                        'ticker/allBookTickers': 1,
+                        'ticker/price': 1,
+                        'ticker/bookTicker': 1,
+                    },
                 },
                 'private': {
-                    'get': [
-                        'order',
-                        'openOrders',
-                        'allOrders',
-                        'account',
-                        'myTrades',
-                    ],
+                    'get': {
+                        'order': 1,
+                        'openOrders': {'cost': 1, 'noSymbol': 40},
+                        'allOrders': 5,
+                        'account': 5,
+                        'myTrades': 5,
+                    },
                     'post': [
                         'order',
                         'order/test',
@@ -24,5 +24,9 @@ from ccxt.base.errors import RequestTimeout                     # noqa: F401
 from ccxt.base.errors import ExchangeNotAvailable               # noqa: F401
 
 from ccxt.async.ws.bitfinex import bitfinex                        # noqa: F401
+from ccxt.async.ws.gdax import gdax                                # noqa: F401
 
-exchanges = ['bitfinex']
+exchanges = [
+    'bitfinex',
+    'gdax',
+]
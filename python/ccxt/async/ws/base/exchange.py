@@ -13,6 +13,7 @@ import aiohttp
 import hashlib
 import sys
 import collections
+import decimal
 import ujson
 from copy import deepcopy
 import time
@@ -22,6 +23,11 @@ import datetime
 
 from ccxt.base.errors import ExchangeError
 from ccxt.base.errors import RequestTimeout
+from ccxt.base.errors import NotSupported
+from ccxt.async.ws.base.order_book import OrderBook
+from ccxt.async.ws.base.order_book import RawOrderBook
+from ccxt.async.ws.base.stream import Stream
+from ccxt.base.shared_order_book import SharedOrderBookWriter
 
 # -----------------------------------------------------------------------------
 
@@ -119,6 +125,23 @@ class Exchange(object):
     rateLimitTokens = 16
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
+    subscribeTimeout = 10000  # milliseconds to wait for the first update of a subscription
+    heartbeatTimeout = 15000  # milliseconds without any incoming message before reconnecting, while subscribed
+    reconnectDelay = 500  # milliseconds before the first reconnect, doubled after every failed attempt
+    reconnectMaxDelay = 30000
+    tradesLimit = 1000  # the number of trades kept per symbol
+    latencySamples = 1000  # the number of subscribe latencies kept for subscribe_latency_stats()
+    queuePolicy = 'block'  # 'block', 'dropOldest' or 'conflate' for the consumers that fall behind
+    updateQueueSize = 1000  # the messages of a subscription waiting for its builder, the reader never waits for them
+    # publish the order books for other processes, read them with ccxt.base.shared_order_book.SharedOrderBookReader
+    # True or {'name': exchange id, 'slots': 64, 'depth': 25, 'path': '/dev/shm' or the temporary directory}
+    sharedOrderBooks = None
+    orderBookValidation = {
+        'checksum': False,  # verify the checksums of the books, where the exchange sends them
+        'sequence': False,  # verify the sequence numbers of the messages, where the exchange sends them
+        'restInterval': 0,  # milliseconds between the comparisons with a REST snapshot, 0 disables them
+        'rest': None,  # the REST exchange for the comparisons, like ccxt.async.gdax()
+    }
     last_http_response = None
     last_json_response = None
 
@@ -141,93 +164,599 @@ class Exchange(object):
         self.aiohttp_session = self.aiohttp_session or aiohttp.ClientSession(loop=self.asyncio_loop)
         self.queue_request = self.queue_request or asyncio.Queue(maxsize=1000)
         self.queue_response = self.queue_response or asyncio.Queue(maxsize=1000)
-        asyncio.ensure_future(self.websocket_handler())
+        self.queues = {}
+        self.orderbooks = {}
+        self.raworderbooks = {}  # symbol -> the book of individual orders
+        self.channel_mapping = {}
+        self.tickers = {}
+        self.trades = {}  # symbol -> the last tradesLimit trades
+        self.subscriptions = {}  # (stream, symbol) -> {'request': packet, 'ready': future of the first update}
+        self.subscribe_timestamps = {}  # (stream, symbol) -> when the subscription was sent, in milliseconds
+        self.subscribe_latency = {}  # (stream, symbol) -> milliseconds from sending the subscription to the first update
+        self.subscribe_latency_samples = collections.deque(maxlen=self.latencySamples)  # of every (re)subscription
+        self.connection = {
+            'connected': False,
+            'connects': 0,
+            'reconnects': 0,
+            'connectedTimestamp': None,
+            'lastMessageTimestamp': None,
+            'lastError': None,
+            'errors': 0,  # the unexpected errors caught in the handlers
+        }
+        self.orderBookValidation = self.extend(Exchange.orderBookValidation, self.orderBookValidation)
+        self.validation_stats = {
+            'checksums': 0,
+            'checksumMismatches': 0,
+            'sequenceGaps': 0,
+            'restChecks': 0,
+            'restMismatches': 0,
+            'resyncs': 0,
+        }
+        self.sequence = None  # the sequence number of the last message of the connection
+        self.ws = None
+        self.shared_order_books = None
+        self.unshared_order_books = set()  # the symbols that did not get a slot in the shared memory
+        if self.sharedOrderBooks:
+            options = self.extend({
+                'name': self.id,
+                'slots': 64,
+                'depth': 25,
+                'path': None,
+            }, self.sharedOrderBooks if isinstance(self.sharedOrderBooks, dict) else {})
+            self.shared_order_books = SharedOrderBookWriter(options['name'], options['slots'], options['depth'], options['path'])
+        self.closed = False
+        self.websocket_task = asyncio.ensure_future(self.websocket_handler())
 
     def __del__(self):
         if self.aiohttp_session:
             self.aiohttp_session.close()
 
+    async def close(self):
+        """ Stops reconnecting, cancels the running tasks and closes the session"""
+        self.closed = True
+        self.websocket_task.cancel()
+        for subscription in self.subscriptions.values():
+            for task in ('task', 'validator'):
+                if task in subscription:
+                    subscription[task].cancel()
+        await self.aiohttp_session.close()
+        self.aiohttp_session = None
+        if self.shared_order_books:
+            self.shared_order_books.close()
+            self.shared_order_books = None
+
     def describe(self):
         return {}
 
     async def websocket_handler(self):
-        async with self.aiohttp_session.ws_connect(self.urls['ws']) as ws:
-            while 1:
-                if self.queue_request.qsize() > 0:
-                    request_packet = await self.queue_request.get()
-                    await ws.send_json(request_packet)
-                    print('sending packet {0}'.format(request_packet))
-                    self.queue_request.task_done()
-
-                response = await ws.receive()
+        """ Keeps the connection open, reconnecting with exponential backoff when it drops"""
+        delay = self.reconnectDelay
+        while not self.closed:
+            try:
+                async with self.aiohttp_session.ws_connect(self.urls['ws']) as ws:
+                    self.ws = ws
+                    self.on_connect()
+                    delay = self.reconnectDelay
+                    await self.websocket_connection(ws)
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                # a missed heartbeat raises asyncio.TimeoutError from the reader
+                self.connection['lastError'] = e
+                if self.verbose:
+                    print('{0} websocket connection error: {1}'.format(self.id, repr(e)))
+            except Exception as e:
+                # a bug must not end the task, the connection starts over from the snapshots
+                self.log_error('websocket connection', e)
+            finally:
+                self.ws = None
+                if self.connection['connected']:
+                    self.on_disconnect()
+            if self.closed:
+                break
+            await asyncio.sleep(delay / 1000)
+            delay = min(delay * 2, self.reconnectMaxDelay)
+
+    def on_connect(self):
+        """ Counts the connection and replays the active subscriptions after a reconnect"""
+        self.connection['connected'] = True
+        self.connection['connectedTimestamp'] = self.milliseconds()
+        self.connection['lastMessageTimestamp'] = None
+        self.connection['connects'] += 1
+        self.sequence = None
+        if self.connection['connects'] == 1:
+            return
+        self.connection['reconnects'] += 1
+        # the packets queued for the previous connection are replaced by the active subscriptions
+        self.drain_queue(self.queue_request)
+        for key, subscription in self.subscriptions.items():
+            self.subscribe_timestamps[key] = self.milliseconds()
+            self.queue_request.put_nowait(subscription['request'])
+
+    def on_disconnect(self):
+        """ Invalidates the books, which stay empty until the next connection sends their snapshots"""
+        self.connection['connected'] = False
+        self.drain_queue(self.queue_response)
+        self.channel_mapping = {}
+        for (stream, symbol) in self.subscriptions:
+            if stream in ('orderbooks', 'raworderbooks'):
+                self.invalidate_order_book(symbol, stream)
+
+    def invalidate_order_book(self, symbol, stream='orderbooks'):
+        """ Clears the book until the snapshot from the new connection arrives"""
+        subscription = self.subscriptions[(stream, symbol)]
+        if subscription['ready'].done():
+            subscription['ready'] = self.asyncio_loop.create_future()
+        self.drain_queue(self.queues[stream][self.market_id(symbol)])
+        books = self.books(stream)
+        if symbol in books:
+            books[symbol].clear()
+            if stream == 'orderbooks':
+                self.share_order_book(symbol)
+
+    def books(self, stream):
+        return self.raworderbooks if stream == 'raworderbooks' else self.orderbooks
+
+    def reset_connection(self):
+        """ Closes the connection, the handler reconnects and subscribes again"""
+        if self.ws is not None:
+            asyncio.ensure_future(self.ws.close())
+
+    def connection_request_packets(self):
+        """ Return the packets sent first on every connection, like the configuration of the feed"""
+        return []
+
+    def unsubscribe_request_packets(self, stream, symbol):
+        """ Return the packets that cancel a subscription before it is renewed"""
+        return []
+
+    def check_sequence(self, sequence):
+        """ Returns False and reconnects when the sequence number of a message is not the next one"""
+        expected = sequence if self.sequence is None else self.sequence + 1
+        self.sequence = sequence
+        if sequence != expected:
+            self.validation_stats['sequenceGaps'] += 1
+            self.reset_connection()
+            return False
+        return True
+
+    def check_order_book_checksum(self, symbol, checksum):
+        """ Returns False and resyncs the book when it does not match the checksum of the exchange"""
+        self.validation_stats['checksums'] += 1
+        if self.order_book_checksum(symbol) != checksum:
+            self.validation_stats['checksumMismatches'] += 1
+            self.resync_order_book(symbol)
+            return False
+        return True
+
+    def order_book_checksum(self, symbol):
+        raise NotSupported(self.id + ' does not support order book checksums')
+
+    def resync_order_book(self, symbol, stream='orderbooks'):
+        """ Clears the book and renews its subscription to get a new snapshot"""
+        self.validation_stats['resyncs'] += 1
+        self.invalidate_order_book(symbol, stream)
+        for request_packet in self.unsubscribe_request_packets(stream, symbol):
+            self.queue_request.put_nowait(request_packet)
+        self.subscribe_timestamps[(stream, symbol)] = self.milliseconds()
+        self.queue_request.put_nowait(self.subscriptions[(stream, symbol)]['request'])
+
+    async def validate_with_rest(self, symbol):
+        """ Compares the book with a REST snapshot periodically, resyncing it after two mismatches in a row"""
+        mismatches = 0
+        while 1:
+            await asyncio.sleep(self.orderBookValidation['restInterval'] / 1000)
+            subscription = self.subscriptions[('orderbooks', symbol)]
+            if not subscription['ready'].done():
+                continue
+            try:
+                snapshot = await self.orderBookValidation['rest'].fetch_order_book(symbol)
+            except Exception as e:
+                if self.verbose:
+                    print('{0} {1} REST order book error: {2}'.format(self.id, symbol, repr(e)))
+                continue
+            if not subscription['ready'].done():
+                continue  # invalidated while waiting for the snapshot
+            self.validation_stats['restChecks'] += 1
+            if self.order_books_diverge(self.orderbooks[symbol], snapshot):
+                self.validation_stats['restMismatches'] += 1
+                mismatches += 1
+                if mismatches >= 2:
+                    mismatches = 0
+                    self.resync_order_book(symbol)
+            else:
+                mismatches = 0
+
+    @staticmethod
+    def order_books_diverge(orderbook, snapshot):
+        """ The books are taken at different times, so only a crossed book or a book
+        that crosses the other one counts as a mismatch"""
+        bid = orderbook.best_bid()
+        ask = orderbook.best_ask()
+        if bid and ask and (bid[0] >= ask[0]):
+            return True
+        if bid and snapshot['asks'] and (bid[0] > snapshot['asks'][0][0]):
+            return True
+        if ask and snapshot['bids'] and (ask[0] < snapshot['bids'][0][0]):
+            return True
+        return False
+
+    @staticmethod
+    def number_to_string(number):
+        """ Like String(number) in JavaScript: 100.0 -> '100', 0.00001 -> '0.00001', 1e-08 -> '1e-8'"""
+        if isinstance(number, float) and number.is_integer() and abs(number) < 1e21:
+            return str(int(number))
+        if isinstance(number, float) and 1e-6 <= abs(number) < 1e-4:
+            return format(decimal.Decimal(repr(number)), 'f')
+        return repr(number).replace('e-0', 'e-').replace('e+0', 'e+')
+
+    @staticmethod
+    def drain_queue(queue):
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+
+    def subscribe_latency_stats(self):
+        """ The count, minimum, mean, maximum and 50th, 95th and 99th percentiles of the milliseconds
+        from sending a subscription to applying its first update, over the last latencySamples ones"""
+        samples = sorted(self.subscribe_latency_samples)
+        if not samples:
+            return {'count': 0, 'min': None, 'mean': None, 'max': None, 'p50': None, 'p95': None, 'p99': None}
+        return {
+            'count': len(samples),
+            'min': samples[0],
+            'mean': sum(samples) / len(samples),
+            'max': samples[-1],
+            'p50': self.percentile(samples, 50),
+            'p95': self.percentile(samples, 95),
+            'p99': self.percentile(samples, 99),
+        }
+
+    @staticmethod
+    def percentile(samples, percent):
+        """ The nearest-rank percentile of the sorted samples, the smallest one that is not below
+        percent % of them, so that percent % of the samples are within the returned bound"""
+        rank = -(-len(samples) * percent // 100)  # ceil
+        return samples[max(rank, 1) - 1]
+
+    def connection_status(self):
+        """ The connection counters with the uptime of the current connection in milliseconds"""
+        connected = self.connection['connected']
+        return self.extend(self.connection, {
+            'uptime': (self.milliseconds() - self.connection['connectedTimestamp']) if connected else 0,
+        })
+
+    async def websocket_connection(self, ws):
+        """ Runs the writer, the reader and the dispatcher of the connection until one of them stops"""
+        for request_packet in self.connection_request_packets():
+            await ws.send_json(request_packet)
+        tasks = [
+            asyncio.ensure_future(self.websocket_writer(ws)),
+            asyncio.ensure_future(self.websocket_reader(ws)),
+            asyncio.ensure_future(self.websocket_dispatcher()),
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # raise the error that stopped the task, if any
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def websocket_writer(self, ws):
+        """ Sends the queued request packets as soon as they are queued"""
+        while 1:
+            request_packet = await self.queue_request.get()
+            await ws.send_json(request_packet)
+            if self.verbose:
+                print('sending packet {0}'.format(request_packet))
+            self.queue_request.task_done()
+
+    async def websocket_reader(self, ws):
+        """ Queues the incoming messages for the dispatcher, until the connection is closed"""
+        while 1:
+            # an idle connection without any subscription is not expected to send anything
+            timeout = (self.heartbeatTimeout / 1000) if self.subscriptions else None
+            response = await ws.receive(timeout=timeout)
+            self.connection['lastMessageTimestamp'] = self.milliseconds()
+            if response.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                return
+            await self.queue_response.put(response)
+
+    async def websocket_dispatcher(self):
+        """ Routes the incoming messages, so that slow handlers do not hold the reader"""
+        while 1:
+            response = await self.queue_response.get()
+            try:
                 await self.event_handler(response)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # one malformed message is dropped, the next ones are still handled
+                self.log_error('event handler', e)
+            self.queue_response.task_done()
+
+    def log_error(self, source, e):
+        """ Records an unexpected error that was caught to keep the connection running"""
+        self.connection['lastError'] = e
+        self.connection['errors'] += 1
+        if self.verbose:
+            print('{0} {1} error: {2}'.format(self.id, source, repr(e)))
 
-    def event_handler(self, response):
-        """ Handles the incoming websocket responses"""
+    async def event_handler(self, response):
+        """ Handles the incoming websocket responses, handing the updates to queue_update"""
         pass
 
+    def queue_update(self, stream, pair_id, data, timestamp, datetime):
+        """ Queues an update for the builder of its subscription without waiting, so that
+        a subscription held back by its consumers does not hold back the others.
+        When the builder falls behind, a book is resynced, because it misses the update,
+        otherwise the oldest queued message is dropped"""
+        queue = self.queues.get(stream, {}).get(pair_id)
+        if queue is None:
+            return
+        if queue.full():
+            symbol = self.markets_by_id[pair_id]['symbol']
+            subscription = self.subscriptions[(stream, symbol)]
+            subscription['updatesDropped'] += 1
+            if stream in ('orderbooks', 'raworderbooks'):
+                self.resync_order_book(symbol, stream)
+                return
+            queue.get_nowait()
+            queue.task_done()
+        queue.put_nowait((data, timestamp, datetime))
+
     def subscribe_order_book_request_packet(self, pair_id):
         """ Return the request packet"""
         pass
 
-    async def subscribe_order_book(self, symbol, status_queue=None):
-        """ Subscribes for order books updates, and fetches updates """
+    def subscribe_raw_order_book_request_packet(self, pair_id):
+        """ Return the request packet"""
+        raise NotSupported(self.id + ' does not support raw order book subscriptions')
+
+    def subscribe_ticker_request_packet(self, pair_id):
+        """ Return the request packet"""
+        raise NotSupported(self.id + ' does not support ticker subscriptions')
+
+    def subscribe_trades_request_packet(self, pair_id):
+        """ Return the request packet"""
+        raise NotSupported(self.id + ' does not support trades subscriptions')
+
+    def subscribe_request_packet(self, stream, pair_id):
+        if stream == 'orderbooks':
+            return self.subscribe_order_book_request_packet(pair_id)
+        elif stream == 'raworderbooks':
+            return self.subscribe_raw_order_book_request_packet(pair_id)
+        elif stream == 'tickers':
+            return self.subscribe_ticker_request_packet(pair_id)
+        elif stream == 'trades':
+            return self.subscribe_trades_request_packet(pair_id)
+        raise NotSupported(self.id + ' unknown stream ' + stream)
+
+    async def subscribe(self, stream, symbol, status_queue=None, policy=None):
+        """ Subscribes for the 'orderbooks', 'raworderbooks', 'tickers' or 'trades' updates of a symbol
+
+        Returns a future resolved when the first update has been applied,
+        subscribing again to the same stream and symbol returns the same future.
+        The policy applies to the status queue: with 'block' a full status queue holds
+        back the updates of the subscription, otherwise its oldest status is dropped."""
+        subscription = self.subscriptions.get((stream, symbol))
+        if subscription:
+            return subscription['ready']
         if self.verbose:
-            print('Subscribing to order book for pair: {0}'.format(symbol))
+            print('Subscribing to {0} for pair: {1}'.format(stream, symbol))
         pair_id = self.market_id(symbol)
-        request_packet = self.subscribe_order_book_request_packet(pair_id)
-        if not 'orderbooks' in self.queues:
-            self.queues['orderbooks'] = {}
-        if not pair_id in self.queues['orderbooks']:
-            self.queues['orderbooks'][pair_id] = asyncio.Queue(maxsize=1000)
+        request_packet = self.subscribe_request_packet(stream, pair_id)
+        subscription = self.subscriptions[(stream, symbol)] = {
+            'request': request_packet,
+            'ready': self.asyncio_loop.create_future(),
+            'consumers': [],  # the queues of the Stream iterators
+            'policy': policy or self.queuePolicy,
+            'statusDropped': 0,
+            'updatesDropped': 0,  # the messages dropped because the builder fell behind
+        }
+        if not stream in self.queues:
+            self.queues[stream] = {}
+        if not pair_id in self.queues[stream]:
+            self.queues[stream][pair_id] = asyncio.Queue(maxsize=self.updateQueueSize)
 
-        # Subscribe to the order book
+        self.subscribe_timestamps[(stream, symbol)] = self.milliseconds()
         await self.queue_request.put(request_packet)
-        asyncio.ensure_future(self.build_order_book(symbol, status_queue))
+        subscription['task'] = asyncio.ensure_future(self.build_stream(stream, symbol, status_queue))
+        if (stream == 'orderbooks') and self.orderBookValidation['restInterval'] and self.orderBookValidation['rest']:
+            subscription['validator'] = asyncio.ensure_future(self.validate_with_rest(symbol))
+        return subscription['ready']
+
+    async def subscribe_order_book(self, symbol, status_queue=None, policy=None):
+        """ Subscribes for order books updates, and fetches updates """
+        return await self.subscribe('orderbooks', symbol, status_queue, policy)
+
+    async def subscribe_raw_order_book(self, symbol, status_queue=None, policy=None):
+        """ Subscribes for the individual orders of the book"""
+        return await self.subscribe('raworderbooks', symbol, status_queue, policy)
+
+    async def subscribe_ticker(self, symbol, status_queue=None, policy=None):
+        return await self.subscribe('tickers', symbol, status_queue, policy)
+
+    async def subscribe_trades(self, symbol, status_queue=None, policy=None):
+        return await self.subscribe('trades', symbol, status_queue, policy)
+
+    def stream(self, stream, symbol, policy=None, maxsize=1000):
+        """ An async iterator over the updates: order book snapshots, tickers or single trades"""
+        return Stream(self, stream, symbol, policy or self.queuePolicy, maxsize)
 
     def order_book_builder(self, data, timestamp, datetime, symbol):
-        """ Build and update the order book """
+        """ Build and update the order book, return False for the messages that do not change it"""
+        pass
+
+    def raw_order_book_builder(self, data, timestamp, datetime, symbol):
+        """ Build and update the book of individual orders, return False for the messages that do not change it"""
         pass
 
-    async def build_order_book(self, symbol, status_queue):
+    def ticker_builder(self, data, timestamp, datetime, symbol):
+        """ Return the ticker parsed like the one of fetch_ticker"""
+        pass
+
+    def trades_builder(self, data, timestamp, datetime, symbol):
+        """ Return the list of new trades parsed like those of fetch_trades"""
+        pass
+
+    def apply_update(self, stream, data, timestamp, datetime, symbol):
+        """ Applies an update and returns the items for the Stream iterators"""
+        if stream == 'orderbooks':
+            if not symbol in self.orderbooks:
+                self.orderbooks[symbol] = OrderBook()
+            if self.order_book_builder(data, timestamp, datetime, symbol) is False:
+                return []  # the message did not change the book
+            self.share_order_book(symbol)
+            return None
+        elif stream == 'raworderbooks':
+            if not symbol in self.raworderbooks:
+                self.raworderbooks[symbol] = RawOrderBook()
+            if self.raw_order_book_builder(data, timestamp, datetime, symbol) is False:
+                return []
+            return None
+        elif stream == 'tickers':
+            ticker = self.ticker_builder(data, timestamp, datetime, symbol)
+            if ticker is None:
+                return []
+            self.tickers[symbol] = ticker
+            return [ticker]
+        trades = self.trades_builder(data, timestamp, datetime, symbol) or []
+        if trades:
+            if not symbol in self.trades:
+                self.trades[symbol] = collections.deque(maxlen=self.tradesLimit)
+            self.trades[symbol].extend(trades)
+        return trades
+
+    async def build_stream(self, stream, symbol, status_queue):
         pair_id = self.market_id(symbol)
+        key = (stream, symbol)
+        subscription = self.subscriptions[key]
+        queue = self.queues[stream][pair_id]
         while 1:
-            (data, timestamp, datetime) = await self.queues['orderbooks'][pair_id].get()
-            if not symbol in self.orderbooks:
-                self.orderbooks[symbol] = {}
-            self.order_book_builder(data, timestamp, datetime, symbol)
-            self.queues['orderbooks'][pair_id].task_done()
+            (data, timestamp, datetime) = await queue.get()
+            try:
+                items = self.apply_update(stream, data, timestamp, datetime, symbol)
+            except Exception as e:
+                self.log_error('{0} {1} builder'.format(stream, symbol), e)
+                items = []
+            queue.task_done()
+            if items == []:
+                continue  # a message without any new data
+            if key in self.subscribe_timestamps:
+                latency = self.milliseconds() - self.subscribe_timestamps.pop(key)
+                self.subscribe_latency[key] = latency
+                self.subscribe_latency_samples.append(latency)
+            if not subscription['ready'].done():
+                subscription['ready'].set_result(True)
+            if subscription['consumers']:
+                await self.publish(stream, symbol, subscription['consumers'], items)
             if status_queue:
-                await status_queue.put({
+                status = {
                     'timestamp': timestamp,
                     'datetime': datetime,
                     'exchange': self.id,
-                    'stream': 'orderbooks',
+                    'stream': stream,
                     'symbol': symbol,
-                })
+                }
+                if subscription['policy'] == 'block':
+                    await status_queue.put(status)
+                else:
+                    if status_queue.full():
+                        status_queue.get_nowait()
+                        subscription['statusDropped'] += 1
+                    status_queue.put_nowait(status)
+
+    async def publish(self, stream, symbol, consumers, items):
+        """ Hands the items to the Stream iterators, an order book update comes as None"""
+        snapshot = None
+        for consumer in list(consumers):
+            if items is not None:
+                for item in items:
+                    await consumer.put(item)
+            elif consumer.policy == 'conflate':
+                await consumer.put(None)  # the snapshot is made when the consumer reads it
+            else:
+                snapshot = snapshot or self.book_fetch(stream, symbol)
+                await consumer.put(snapshot)
+
+    def share_order_book(self, symbol):
+        """ Writes the top of the book to the shared memory of the other processes"""
+        if self.shared_order_books and (symbol not in self.unshared_order_books):
+            orderbook = self.orderbooks[symbol]
+            depth = self.shared_order_books.depth
+            try:
+                self.shared_order_books.write(symbol, orderbook.bids.top(depth), orderbook.asks.top(depth), orderbook.timestamp)
+            except NotSupported as e:
+                # the other symbols are still shared, this one is only kept in this process
+                self.unshared_order_books.add(symbol)
+                if self.verbose:
+                    print('{0} {1} order book is not shared: {2}'.format(self.id, symbol, str(e)))
+
+    def queue_metrics(self):
+        """ The depth of the connection queues and of the queues of every subscription,
+        with the numbers of updates dropped and conflated for the consumers"""
+        subscriptions = {}
+        for (stream, symbol), subscription in self.subscriptions.items():
+            subscriptions[(stream, symbol)] = {
+                'policy': subscription['policy'],
+                'size': self.queues[stream][self.market_id(symbol)].qsize(),
+                'statusDropped': subscription['statusDropped'],
+                'updatesDropped': subscription['updatesDropped'],
+                'consumers': [consumer.stats() for consumer in subscription['consumers']],
+            }
+        return {
+            'requests': self.queue_request.qsize(),
+            'responses': self.queue_response.qsize(),
+            'subscriptions': subscriptions,
+        }
 
-    def order_book_fetch(self, symbol):
+    def order_book_fetch(self, symbol, limit=None):
         """ process in memory order book to standard ccxt order book format"""
-        pass
-
-    async def fetchOrderBook(self, symbol):
-        pair_id = self.market_id(symbol)
-        # Check if already subscribed, if not subscribe
-        if not self.channel_mapping:
-            await self.subscribe_order_book(symbol)
-            await asyncio.sleep(3)
-        else:
-            for chanId, (channel, pair) in self.channel_mapping.items():
-                if not channel == 'book' and pair == pair_id:
-                    await self.subscribe_order_book(symbol)
-                    await asyncio.sleep(3)
-
-        if symbol in list(self.orderbooks):
-            asks, bids, orderbook = self.order_book_fetch(symbol)
-            return {'asks': asks,
-                    'bids': bids,
-                    'timestamp': orderbook['timestamp'],
-                    'datetime': orderbook['datetime']}
+        return self.orderbooks[symbol].snapshot(limit)
+
+    def raw_order_book_fetch(self, symbol, limit=None):
+        """ The orders of the best limit levels as [price, amount, id]"""
+        return self.raworderbooks[symbol].raw_snapshot(limit)
+
+    def book_fetch(self, stream, symbol, limit=None):
+        if stream == 'raworderbooks':
+            return self.raw_order_book_fetch(symbol, limit)
+        return self.order_book_fetch(symbol, limit)
+
+    async def fetchOrderBook(self, symbol, limit=None):
+        # subscribe on the first call and wait for the first update of the book
+        ready = await self.subscribe_order_book(symbol)
+        await self.wait_for_subscription(ready, symbol)
+        return self.order_book_fetch(symbol, limit)
+
+    async def fetchRawOrderBook(self, symbol, limit=None, aggregate=False):
+        """ The L3 book of individual orders, or its L2 view with aggregate=True"""
+        ready = await self.subscribe_raw_order_book(symbol)
+        await self.wait_for_subscription(ready, symbol)
+        if aggregate:
+            return self.raworderbooks[symbol].snapshot(limit)
+        return self.raw_order_book_fetch(symbol, limit)
+
+    async def fetchTicker(self, symbol):
+        ready = await self.subscribe_ticker(symbol)
+        await self.wait_for_subscription(ready, symbol)
+        return self.tickers[symbol]
+
+    async def fetchTrades(self, symbol, since=None, limit=None):
+        ready = await self.subscribe_trades(symbol)
+        await self.wait_for_subscription(ready, symbol)
+        trades = [trade for trade in self.trades.get(symbol, []) if (since is None) or (trade['timestamp'] >= since)]
+        return trades if limit is None else trades[-limit:]
+
+    async def wait_for_subscription(self, ready, symbol):
+        if ready.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), self.subscribeTimeout / 1000)
+        except asyncio.TimeoutError:
+            raise RequestTimeout(self.id + ' ' + symbol + ' subscription timed out after ' + str(self.subscribeTimeout) + ' ms')
 
     @staticmethod
     def decimal(number):
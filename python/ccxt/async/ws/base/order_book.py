@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""Sorted L2 and raw L3 order books for websocket feeds"""
+
+import bisect
+import collections
+
+__all__ = [
+    'OrderBook',
+    'OrderBookSide',
+    'RawOrderBook',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class OrderBookSide(object):
+    """The price levels of one side of the book, sorted best first
+
+    Lookups go through a dict and the position of a price is found by binary search
+    in a sorted list of keys, the insertion itself is a memmove of the list, which
+    is faster than a tree in Python for books of a few thousand levels.
+    """
+
+    def __init__(self, descending=False):
+        self.descending = descending  # bids are sorted by descending price
+        self.keys = []    # the sorted prices, negated for the bids so that the best one comes first
+        self.levels = {}  # price -> amount
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __contains__(self, price):
+        return price in self.levels
+
+    def key(self, price):
+        return -price if self.descending else price
+
+    def price(self, key):
+        return -key if self.descending else key
+
+    def update(self, price, amount):
+        """Add or replace a price level, an amount of zero deletes it"""
+        if not amount:
+            return self.delete(price)
+        if price not in self.levels:
+            bisect.insort(self.keys, self.key(price))
+        self.levels[price] = amount
+
+    def delete(self, price):
+        if self.levels.pop(price, None) is None:
+            return
+        key = self.key(price)
+        del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def reset(self, levels=[]):
+        """Replace all price levels with a list of [price, amount]"""
+        self.levels = dict((price, amount) for price, amount in levels if amount)
+        self.keys = sorted(self.key(price) for price in self.levels)
+
+    def clear(self):
+        self.levels = {}
+        self.keys = []
+
+    def best(self):
+        """The best [price, amount] or None when the side is empty"""
+        if not self.keys:
+            return None
+        price = self.price(self.keys[0])
+        return [price, self.levels[price]]
+
+    def top(self, limit=None):
+        """The best limit levels as a list of [price, amount], all of them by default"""
+        keys = self.keys if limit is None else self.keys[:limit]
+        levels = self.levels
+        if self.descending:
+            return [[-key, levels[-key]] for key in keys]
+        return [[key, levels[key]] for key in keys]
+
+# -----------------------------------------------------------------------------
+
+
+class OrderBook(object):
+    """Bids and asks with the time of the last change"""
+
+    def __init__(self):
+        self.bids = OrderBookSide(descending=True)
+        self.asks = OrderBookSide()
+        self.timestamp = None
+        self.datetime = None
+
+    def reset(self, bids=[], asks=[], timestamp=None, datetime=None):
+        self.bids.reset(bids)
+        self.asks.reset(asks)
+        self.touch(timestamp, datetime)
+
+    def clear(self):
+        self.bids.clear()
+        self.asks.clear()
+        self.touch(None, None)
+
+    def touch(self, timestamp, datetime):
+        self.timestamp = timestamp
+        self.datetime = datetime
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def snapshot(self, limit=None):
+        """The book in the ccxt format with at most limit levels per side"""
+        return {
+            'bids': self.bids.top(limit),
+            'asks': self.asks.top(limit),
+            'timestamp': self.timestamp,
+            'datetime': self.datetime,
+        }
+
+# -----------------------------------------------------------------------------
+
+
+class RawOrderBook(OrderBook):
+    """Individual orders by id, aggregated into the price levels of the L2 view as they change
+
+    The orders of a price level are kept in the order of their arrival, an order that
+    changes its amount at the same price keeps its place in the queue of the level.
+    """
+
+    def __init__(self):
+        super(RawOrderBook, self).__init__()
+        self.orders = {}  # id -> (side, price, amount)
+        self.level_orders = {'bids': {}, 'asks': {}}  # side -> price -> OrderedDict of id -> amount
+
+    def reset(self, orders=[], timestamp=None, datetime=None):
+        """Replace all orders with a list of [id, side, price, amount]"""
+        self.orders = {}
+        self.level_orders = {'bids': {}, 'asks': {}}
+        for id, side, price, amount in orders:
+            self.add(id, side, price, amount)
+        self.bids.reset([[price, sum(level.values())] for price, level in self.level_orders['bids'].items()])
+        self.asks.reset([[price, sum(level.values())] for price, level in self.level_orders['asks'].items()])
+        self.touch(timestamp, datetime)
+
+    def clear(self):
+        super(RawOrderBook, self).clear()
+        self.orders = {}
+        self.level_orders = {'bids': {}, 'asks': {}}
+
+    def add(self, id, side, price, amount):
+        self.orders[id] = (side, price, amount)
+        levels = self.level_orders[side]
+        if price not in levels:
+            levels[price] = collections.OrderedDict()
+        levels[price][id] = amount
+
+    def update(self, id, side, price, amount):
+        """Add, change or move an order"""
+        order = self.orders.get(id)
+        if (order is not None) and ((order[0] != side) or (order[1] != price)):
+            self.delete(id)
+            order = None
+        if order is None:
+            self.add(id, side, price, amount)
+        else:
+            self.orders[id] = (side, price, amount)
+            self.level_orders[side][price][id] = amount  # keeps the place in the queue
+        self.aggregate(side, price)
+
+    def delete(self, id):
+        order = self.orders.pop(id, None)
+        if order is None:
+            return
+        side, price, amount = order
+        levels = self.level_orders[side]
+        del levels[price][id]
+        if not levels[price]:
+            del levels[price]
+        self.aggregate(side, price)
+
+    def aggregate(self, side, price):
+        """Sums the orders of one level again, which does not accumulate rounding errors"""
+        orders = self.level_orders[side].get(price)
+        getattr(self, side).update(price, sum(orders.values()) if orders else 0)
+
+    def order(self, id):
+        """The [price, amount, id] of an order, or None"""
+        order = self.orders.get(id)
+        return None if order is None else [order[1], order[2], id]
+
+    def queue_position(self, id):
+        """The amount of the orders ahead of an order at its price level"""
+        side, price, amount = self.orders[id]
+        ahead = 0
+        for other, other_amount in self.level_orders[side][price].items():
+            if other == id:
+                break
+            ahead += other_amount
+        return ahead
+
+    def raw_snapshot(self, limit=None):
+        """The orders of the best limit levels per side as [price, amount, id] in the ccxt L3 format"""
+        result = {
+            'timestamp': self.timestamp,
+            'datetime': self.datetime,
+        }
+        for side in ('bids', 'asks'):
+            levels = self.level_orders[side]
+            result[side] = [[price, amount, id] for price, _ in getattr(self, side).top(limit) for id, amount in levels[price].items()]
+        return result
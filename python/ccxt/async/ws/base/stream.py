@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Async iteration over the updates of a websocket subscription"""
+
+from ccxt.async.ws.base.update_queue import UpdateQueue
+
+__all__ = [
+    'Stream',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class Stream(object):
+    """Subscribes on the first iteration and yields every update applied after that
+
+        async for ticker in exchange.stream('tickers', 'BTC/USD'):
+            ...
+
+    With the 'conflate' policy every item is the latest state, with the number of
+    updates it stands for under the 'updates' key.
+    """
+
+    def __init__(self, exchange, stream, symbol, policy='block', maxsize=1000):
+        self.exchange = exchange
+        self.stream = stream
+        self.symbol = symbol
+        self.queue = UpdateQueue(policy, maxsize)
+        self.subscription = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.subscription is None:
+            await self.exchange.subscribe(self.stream, self.symbol)
+            self.subscription = self.exchange.subscriptions[(self.stream, self.symbol)]
+            self.subscription['consumers'].append(self.queue)
+        item = await self.queue.get()
+        if item is None:
+            item = self.exchange.book_fetch(self.stream, self.symbol)  # a conflated order book update
+        if self.queue.policy == 'conflate':
+            item = self.exchange.extend(item, {'updates': self.queue.updates})
+        return item
+
+    def close(self):
+        """Stops receiving the updates, the subscription itself stays active"""
+        if self.subscription is not None:
+            self.subscription['consumers'].remove(self.queue)
+            self.subscription = None
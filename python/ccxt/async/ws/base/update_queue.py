@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""A queue of websocket updates with a policy for consumers that fall behind"""
+
+import asyncio
+
+__all__ = [
+    'UpdateQueue',
+    'policies',
+]
+
+# -----------------------------------------------------------------------------
+
+policies = [
+    'block',       # wait for room in the queue, which holds back the feed of the producer
+    'dropOldest',  # discard the oldest queued update to make room for the new one
+    'conflate',    # keep only the latest update and the number of updates it replaces
+]
+
+# -----------------------------------------------------------------------------
+
+
+class UpdateQueue(object):
+
+    def __init__(self, policy='block', maxsize=1000):
+        if policy not in policies:
+            raise ValueError('unknown queue policy ' + str(policy))
+        self.policy = policy
+        self.maxsize = maxsize
+        self.queue = asyncio.Queue(maxsize=1 if policy == 'conflate' else maxsize)
+        self.updates = 0     # the number of updates merged into the last item returned by get()
+        self.pending = 0     # the number of updates merged into the queued item when conflating
+        self.received = 0
+        self.dropped = 0
+        self.conflated = 0
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    async def put(self, item):
+        self.received += 1
+        if self.policy == 'block':
+            await self.queue.put(item)
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            if self.policy == 'conflate':
+                self.conflated += 1
+            else:
+                self.dropped += 1
+        if self.policy == 'conflate':
+            self.pending += 1
+        self.queue.put_nowait(item)
+
+    async def get(self):
+        item = await self.queue.get()
+        if self.policy == 'conflate':
+            self.updates, self.pending = self.pending, 0
+        else:
+            self.updates = 1
+        return item
+
+    def stats(self):
+        return {
+            'policy': self.policy,
+            'size': self.queue.qsize(),
+            'maxSize': self.maxsize,
+            'received': self.received,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+        }
@@ -6,6 +6,7 @@ import hashlib
 import sys
 import collections
 import ujson
+import zlib
 from copy import deepcopy
 import time
 import datetime
@@ -23,6 +24,13 @@ from ccxt.base.errors import InsufficientFunds
 
 class bitfinex (Exchange):
 
+    channel_streams = {
+        'book': 'orderbooks',
+        'rawbook': 'raworderbooks',
+        'ticker': 'tickers',
+        'trades': 'trades',
+    }
+
     def describe(self):
         return self.deep_extend(super(bitfinex, self).describe(), {
             'id': 'bitfinex',
@@ -68,7 +76,7 @@ class bitfinex (Exchange):
                 'api': 'https://api.bitfinex.com',
                 'www': 'https://www.bitfinex.com',
                 'doc': 'https://bitfinex.readme.io/v1/docs',
-                'ws': 'wss://api.bitfinex.com/ws',
+                'ws': 'wss://api.bitfinex.com/ws/2',  # the sequence numbers and the checksums are v2 flags
             },
             'api': {
                 'public': {
@@ -76,7 +84,7 @@ class bitfinex (Exchange):
                         'order_book': {
                             'event': 'subscribe',
                             'channel': 'book',
-                            'pair': 'pair',
+                            'symbol': 'symbol',
                             'prec': 'P0',
                             'freq': 'F0',
                             'len': '100',
@@ -84,18 +92,18 @@ class bitfinex (Exchange):
                         'raw_oder_book': {
                             'event': 'subscribe',
                             'channel': 'book',
-                            'pair': 'pair',
+                            'symbol': 'symbol',
                             'prec': 'R0',
                         },
                         'trades': {
                             'event': 'subscribe',
                             'channel': 'trades',
-                            'pair': 'pair',
+                            'symbol': 'symbol',
                         },
                         'ticker': {
                             'event': 'subscribe',
                             'channel': 'ticker',
-                            'pair': 'pair',
+                            'symbol': 'symbol',
                         },
                         'ping': {
                             'event': 'ping'
@@ -131,47 +139,158 @@ class bitfinex (Exchange):
         data = ujson.loads(response.data)
         if isinstance(data, dict):
             if data['event'] == 'subscribed':
-                print('Subscribed to channel: {0}, for pair: {1}, on channel ID: {2}'.format(data['channel'], data['pair'], data['chanId']))
-                self.channel_mapping[data['chanId']] = (data['channel'], data['pair'])
+                pair_id = data['symbol'][1:]  # tBTCUSD
+                if self.verbose:
+                    print('Subscribed to channel: {0}, for pair: {1}, on channel ID: {2}'.format(data['channel'], pair_id, data['chanId']))
+                # the raw and the aggregated books share the 'book' channel
+                channel = 'rawbook' if data.get('prec') == 'R0' else data['channel']
+                self.channel_mapping[data['chanId']] = (channel, pair_id)
             elif data['event'] == 'info':
-                print('Exchange: {0} Websocket version: {1}'.format(self.id, data['version']))
+                if self.verbose:
+                    print('Exchange: {0} Websocket info: {1}'.format(self.id, data))
         elif isinstance(data, list):
-            if isinstance(data[1], str):
-                print('Heartbeat on channel {0}'.format(data[0]))
-            else:
+            if self.orderBookValidation['sequence']:
+                # the sequence number is the last field of every message
+                sequence = data.pop()
+                if not self.check_sequence(sequence):
+                    return
+            if data[1] == 'hb':
+                if self.verbose:
+                    print('Heartbeat on channel {0}'.format(data[0]))
+            elif data[0] in self.channel_mapping:
                 # Published data, time stamp and send to appropriate queue
                 timestamp = self.microseconds() / 1000
                 datetime = self.iso8601(timestamp)
-                if self.channel_mapping[data[0]][0] == 'book':
-                    pair_id = self.channel_mapping[data[0]][1]
-                    await self.queues['orderbooks'][pair_id].put((data, timestamp, datetime))
+                channel, pair_id = self.channel_mapping[data[0]]
+                self.queue_update(self.channel_streams[channel], pair_id, data, timestamp, datetime)
 
     def subscribe_order_book_request_packet(self, pair_id):
         """ Return the request packet"""
         request_packet = deepcopy(self.api['public']['request']['order_book'])
-        request_packet.update({'pair': pair_id})
+        request_packet.update({'symbol': 't' + pair_id})
+        return request_packet
+
+    def subscribe_raw_order_book_request_packet(self, pair_id):
+        """ Return the request packet"""
+        request_packet = deepcopy(self.api['public']['request']['raw_oder_book'])
+        request_packet.update({'symbol': 't' + pair_id})
+        return request_packet
+
+    def connection_request_packets(self):
+        """ Turn the sequence numbers and the checksums on"""
+        flags = 0
+        if self.orderBookValidation['sequence']:
+            flags |= 65536  # SEQ_ALL
+        if self.orderBookValidation['checksum']:
+            flags |= 131072  # OB_CHECKSUM
+        return [{'event': 'conf', 'flags': flags}] if flags else []
+
+    def unsubscribe_request_packets(self, stream, symbol):
+        """ Return the request packets"""
+        channel = [channel for channel in self.channel_streams if self.channel_streams[channel] == stream][0]
+        pair_id = self.market_id(symbol)
+        for chanId, mapping in list(self.channel_mapping.items()):
+            if mapping == (channel, pair_id):
+                # the updates still sent on the channel are ignored from now on
+                del self.channel_mapping[chanId]
+                return [{'event': 'unsubscribe', 'chanId': chanId}]
+        return []
+
+    def order_book_checksum(self, symbol):
+        """ The signed CRC32 of the top 25 bids and asks as 'bid:amount:ask:-amount:...'"""
+        orderbook = self.orderbooks[symbol]
+        bids = orderbook.bids.top(25)
+        asks = orderbook.asks.top(25)
+        values = []
+        for i in range(0, 25):
+            if i < len(bids):
+                values.extend([bids[i][0], bids[i][1]])
+            if i < len(asks):
+                values.extend([asks[i][0], -asks[i][1]])
+        checksum = zlib.crc32(':'.join([self.number_to_string(value) for value in values]).encode()) & 0xffffffff
+        return checksum - 0x100000000 if checksum >= 0x80000000 else checksum
+
+    def subscribe_ticker_request_packet(self, pair_id):
+        """ Return the request packet"""
+        request_packet = deepcopy(self.api['public']['request']['ticker'])
+        request_packet.update({'symbol': 't' + pair_id})
+        return request_packet
+
+    def subscribe_trades_request_packet(self, pair_id):
+        """ Return the request packet"""
+        request_packet = deepcopy(self.api['public']['request']['trades'])
+        request_packet.update({'symbol': 't' + pair_id})
         return request_packet
 
+    def ticker_builder(self, data, timestamp, datetime, symbol):
+        """ Parse [chanId, [bid, bidSize, ask, askSize, dailyChange, dailyChangePerc, lastPrice, volume, high, low]]"""
+        ticker = data[1]
+        last = ticker[6]
+        return {
+            'symbol': symbol,
+            'timestamp': timestamp,
+            'datetime': datetime,
+            'high': ticker[8],
+            'low': ticker[9],
+            'bid': ticker[0],
+            'ask': ticker[2],
+            'vwap': None,
+            'open': last - ticker[4],
+            'close': None,
+            'first': None,
+            'last': last,
+            'change': ticker[4],
+            'percentage': ticker[5] * 100,
+            'average': (ticker[0] + ticker[2]) / 2,
+            'baseVolume': ticker[7],
+            'quoteVolume': None,
+            'info': data,
+        }
+
+    def trades_builder(self, data, timestamp, datetime, symbol):
+        """ Parse the snapshot [chanId, [[id, timestamp, amount, price], ...]] and the
+        updates [chanId, 'te', [id, timestamp, amount, price]], the 'tu' messages
+        are skipped, they repeat the 'te' message later"""
+        if isinstance(data[1], list):
+            return [self.parse_ws_trade(trade, symbol) for trade in reversed(data[1])]  # oldest first
+        elif data[1] == 'te':
+            return [self.parse_ws_trade(data[2], symbol)]
+        return []
+
+    def parse_ws_trade(self, trade, symbol):
+        id, timestamp, amount, price = trade[0:4]
+        return {
+            'id': str(id),
+            'info': trade,
+            'timestamp': timestamp,
+            'datetime': self.iso8601(timestamp),
+            'symbol': symbol,
+            'type': None,
+            'order': None,
+            'side': 'buy' if amount > 0 else 'sell',
+            'price': price,
+            'amount': abs(amount),
+            'cost': price * abs(amount),
+            'fee': None,
+        }
+
     def order_book_builder(self, data, timestamp, datetime, symbol):
         """ Build and update the order book """
-        if isinstance(data[1], list):
-            data = data[1]
+        orderbook = self.orderbooks[symbol]
+        if data[1] == 'cs':
+            # [chanId, 'cs', checksum]
+            self.check_order_book_checksum(symbol, data[2])
+            return False
+        if not data[1] or isinstance(data[1][0], list):
             # Price, Count, Amount
-            bids = {
-                str(level[0]): [str(level[1]), str(level[2])]
-                for level in data if level[2] > 0
-            }
-            asks = {
-                str(level[0]): [str(level[1]), str(abs(level[2]))]
-                for level in data if level[2] < 0
-            }
-            self.orderbooks[symbol].update({'bids': bids})
-            self.orderbooks[symbol].update({'asks': asks})
-            self.orderbooks[symbol].update({'timestamp': timestamp})
-            self.orderbooks[symbol].update({'datetime': datetime})
-
+            levels = data[1]
+            orderbook.reset(
+                [[level[0], level[2]] for level in levels if level[2] > 0],
+                [[level[0], -level[2]] for level in levels if level[2] < 0],
+                timestamp,
+                datetime)
         else:
-            # Example update message structure [1765.2, 0, 1] where we have [price, count, amount].
+            # Example update message structure [chanId, [1765.2, 0, 1]] where we have [price, count, amount].
             # Update algorithm pseudocode from Bitfinex documentation:
             # 1. - When count > 0 then you have to add or update the price level.
             #   1.1- If amount > 0 then add/update bids.
@@ -179,29 +298,36 @@ class bitfinex (Exchange):
             # 2. - When count = 0 then you have to delete the price level.
             #   2.1- If amount = 1 then remove from bids
             #   2.2- If amount = -1 then remove from asks
-            data = data[1:]
-            data = [str(data[0]), str(data[1]), str(data[2])]
-            if int(data[1]) > 0:  # 1.
-
-                if float(data[2]) > 0:  # 1.1
-                    self.orderbooks[symbol]['bids'].update({data[0]: [data[1], data[2]]})
+            price, count, amount = data[1]
+            if count > 0:  # 1.
+                if amount > 0:  # 1.1
+                    orderbook.bids.update(price, amount)
+                elif amount < 0:  # 1.2
+                    orderbook.asks.update(price, -amount)
+            elif count == 0:  # 2.
+                if amount == 1:  # 2.1
+                    orderbook.bids.delete(price)
+                elif amount == -1:  # 2.2
+                    orderbook.asks.delete(price)
+            orderbook.touch(timestamp, datetime)
 
-                elif float(data[2]) < 0:  # 1.2
-                    self.orderbooks[symbol]['asks'].update({data[0]: [data[1], str(abs(float(data[2])))]})
-
-            elif data[1] == '0':  # 2.
-
-                if data[2] == '1':  # 2.1
-                    if self.orderbooks[symbol]['bids'].get(data[0]):
-                        del self.orderbooks[symbol]['bids'][data[0]]
-
-                elif data[2] == '-1':  # 2.2
-                    if self.orderbooks[symbol]['asks'].get(data[0]):
-                        del self.orderbooks[symbol]['asks'][data[0]]
-
-    def order_book_fetch(self, symbol):
-        """ process in memory order book to standard ccxt order book format"""
-        orderbook = self.orderbooks[symbol]
-        asks = [[float(price), float(stats[0]) * float(stats[1])] for price, stats in orderbook['asks'].items()]
-        bids = [[float(price), float(stats[0]) * float(stats[1])] for price, stats in orderbook['bids'].items()]
-        return asks, bids, orderbook
+    def raw_order_book_builder(self, data, timestamp, datetime, symbol):
+        """ Build and update the book of individual orders"""
+        orderbook = self.raworderbooks[symbol]
+        if data[1] == 'cs':
+            # the checksum covers the aggregated book only
+            return False
+        if not data[1] or isinstance(data[1][0], list):
+            # Order ID, Price, Amount
+            orderbook.reset(
+                [[order[0], 'bids' if order[2] > 0 else 'asks', order[1], abs(order[2])] for order in data[1]],
+                timestamp,
+                datetime)
+        else:
+            # A price of 0 removes the order, otherwise it is added or updated
+            id, price, amount = data[1]
+            if price == 0:
+                orderbook.delete(id)
+            else:
+                orderbook.update(id, 'bids' if amount > 0 else 'asks', price, abs(amount))
+            orderbook.touch(timestamp, datetime)
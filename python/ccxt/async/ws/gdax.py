@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import ujson
+from copy import deepcopy
+
+# -----------------------------------------------------------------------------
+
 from ccxt.async.ws.base.exchange import Exchange
 
-from ccxt.base.errors import ExchangeError
-from ccxt.base.errors import NotSupported
-from ccxt.base.errors import InsufficientFunds
+# -----------------------------------------------------------------------------
 
 
 class gdax (Exchange):
@@ -46,7 +49,30 @@ class gdax (Exchange):
                 'ws': 'wss://ws-feed.gdax.com',
             },
             'api': {
-            }
+                'public': {
+                    'request': {
+                        'order_book': {
+                            'type': 'subscribe',
+                            'product_ids': [],
+                            # the heartbeats keep quiet products from looking like a dead connection
+                            'channels': ['level2', 'heartbeat'],
+                        },
+                    },
+                },
+            },
+            'markets': {
+                'BTC/USD': {'id': 'BTC-USD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'},
+                'BTC/EUR': {'id': 'BTC-EUR', 'symbol': 'BTC/EUR', 'base': 'BTC', 'quote': 'EUR'},
+                'BTC/GBP': {'id': 'BTC-GBP', 'symbol': 'BTC/GBP', 'base': 'BTC', 'quote': 'GBP'},
+                'BCH/USD': {'id': 'BCH-USD', 'symbol': 'BCH/USD', 'base': 'BCH', 'quote': 'USD'},
+                'BCH/BTC': {'id': 'BCH-BTC', 'symbol': 'BCH/BTC', 'base': 'BCH', 'quote': 'BTC'},
+                'ETH/USD': {'id': 'ETH-USD', 'symbol': 'ETH/USD', 'base': 'ETH', 'quote': 'USD'},
+                'ETH/EUR': {'id': 'ETH-EUR', 'symbol': 'ETH/EUR', 'base': 'ETH', 'quote': 'EUR'},
+                'ETH/BTC': {'id': 'ETH-BTC', 'symbol': 'ETH/BTC', 'base': 'ETH', 'quote': 'BTC'},
+                'LTC/USD': {'id': 'LTC-USD', 'symbol': 'LTC/USD', 'base': 'LTC', 'quote': 'USD'},
+                'LTC/EUR': {'id': 'LTC-EUR', 'symbol': 'LTC/EUR', 'base': 'LTC', 'quote': 'EUR'},
+                'LTC/BTC': {'id': 'LTC-BTC', 'symbol': 'LTC/BTC', 'base': 'LTC', 'quote': 'BTC'},
+            },
             'fees': {
                 'trading': {
                     'maker': 0.0,
@@ -54,3 +80,41 @@ class gdax (Exchange):
                 },
             },
         })
+
+    async def event_handler(self, response):
+        """ Handles the incoming responses"""
+        data = ujson.loads(response.data)
+        type = data.get('type')
+        if type in ('snapshot', 'l2update'):
+            timestamp = self.microseconds() / 1000
+            datetime = self.iso8601(timestamp)
+            self.queue_update('orderbooks', data.get('product_id'), data, timestamp, datetime)
+        elif type == 'error':
+            if self.verbose:
+                print('Exchange: {0} error: {1} {2}'.format(self.id, data.get('message'), data.get('reason')))
+        elif type == 'subscriptions':
+            if self.verbose:
+                print('Subscribed to channels: {0}'.format(data['channels']))
+
+    def subscribe_order_book_request_packet(self, pair_id):
+        """ Return the request packet"""
+        request_packet = deepcopy(self.api['public']['request']['order_book'])
+        request_packet.update({'product_ids': [pair_id]})
+        return request_packet
+
+    def order_book_builder(self, data, timestamp, datetime, symbol):
+        """ Build and update the order book """
+        orderbook = self.orderbooks[symbol]
+        if data['type'] == 'snapshot':
+            # [price, size]
+            orderbook.reset(
+                [[float(level[0]), float(level[1])] for level in data['bids']],
+                [[float(level[0]), float(level[1])] for level in data['asks']],
+                timestamp,
+                datetime)
+        else:
+            # [side, price, size], a size of zero removes the price level
+            for side, price, amount in data['changes']:
+                book_side = orderbook.bids if side == 'buy' else orderbook.asks
+                book_side.update(float(price), float(amount))
+            orderbook.touch(timestamp, datetime)
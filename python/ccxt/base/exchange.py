@@ -9,6 +9,7 @@ __version__ = '1.10.1094'
 # -----------------------------------------------------------------------------
 
 from ccxt.base.errors import ExchangeError
+from ccxt.base.errors import BaseError
 from ccxt.base.errors import NotSupported
 from ccxt.base.errors import AuthenticationError
 from ccxt.base.errors import DDoSProtection
@@ -17,6 +18,16 @@ from ccxt.base.errors import ExchangeNotAvailable
 
 # -----------------------------------------------------------------------------
 
+from ccxt.base.response_cache import ResponseCache
+from ccxt.base.market_cache import MarketCache
+from ccxt.base.json_codec import get_json_codec
+from ccxt.base.rate_limit_budget import RateLimitBudget
+from ccxt.base.nonce import FileNonce
+from ccxt.base.nonce import get_nonce_source
+from ccxt.base.shared_token_bucket import SharedTokenBucket
+
+# -----------------------------------------------------------------------------
+
 __all__ = [
     'Exchange',
 ]
@@ -27,14 +38,16 @@ __all__ = [
 import base64
 import calendar
 import collections
+import copy
 import datetime
+import email.utils
 import functools
 import gzip
 import hashlib
 import hmac
 import io
-import json
 import math
+import random
 from numbers import Number
 import re
 from requests import Session
@@ -68,6 +81,10 @@ except NameError:
 
 # -----------------------------------------------------------------------------
 
+json_codec = get_json_codec()  # the default codec, the fastest one installed
+
+# -----------------------------------------------------------------------------
+
 
 class Exchange(object):
     """Base exchange class"""
@@ -125,6 +142,9 @@ class Exchange(object):
     markets_by_id = None
     currencies_by_id = None
     options = {}  # Python does not allow to define properties in run-time with setattr
+    jsonCodec = 'auto'  # 'orjson', 'ujson', 'json' or 'auto' for the fastest one installed
+    # describe() keys that are changed in run-time and copied for every instance, the others are shared read-only
+    mutableSettings = ['options', 'fees', 'urls', 'has', 'markets', 'currencies', 'limits', 'precision', 'headers']
 
     hasPublicAPI = True
     hasPrivateAPI = True
@@ -183,6 +203,7 @@ class Exchange(object):
 
     substituteCommonCurrencyCodes = True
     lastRestRequestTimestamp = 0
+    lastRestRequestCost = 0  # the rate limiter cost of the last request, paid by the next one
     lastRestPollTimestamp = 0
     restRequestQueue = None
     restPollerLoopIsRunning = False
@@ -191,6 +212,44 @@ class Exchange(object):
     rateLimitUpdateTime = 0
     last_http_response = None
     last_json_response = None
+    last_response_headers = None
+    endpoints = None
+    implicit_methods = None
+    cacheTTL = {}  # implicit api method name -> milliseconds to cache its GET responses for
+    cacheMaxSize = 1000
+    responseCache = None
+    marketsCache = {
+        'enabled': False,  # keep the fetch_markets/fetch_currencies output in a local file
+        'path': None,  # folder of the cache files, ~/.cache/ccxt by default
+        'maxAge': 86400000,  # milliseconds, older caches are refreshed first and only used if that fails
+    }
+    adaptiveRateLimit = {
+        'enabled': False,  # slow down on DDoSProtection and Retry-After, speed up again after successes
+        'decrease': 0.5,  # the rate is multiplied by it whenever the exchange pushes back
+        'increase': 0.05,  # the fraction of the configured rate regained after a run of successes
+        'successes': 10,  # the length of that run
+        'minFactor': 0.05,  # the lowest fraction of the configured rate
+    }
+    rateLimitFactor = 1.0  # the fraction of the configured rate in effect
+    rateLimitSuccesses = 0
+    rateLimitPausedUntil = 0  # milliseconds, as requested by a Retry-After header
+    rateLimitHeaders = None  # the response headers with the request budget, see RateLimitBudget
+    rate_limit_budget = None
+    retryPolicy = {
+        'maxRetries': 3,  # 0 turns the retries off
+        'baseDelay': 200,  # milliseconds, the backoff grows with a decorrelated jitter from it
+        'maxDelay': 5000,
+        'timeBudget': 15000,  # milliseconds for all attempts of a request together
+        'apis': ['public'],  # only idempotent requests are safe to repeat
+        'methods': ['GET'],
+        'errors': ['RequestTimeout', 'ExchangeNotAvailable', 'DDoSProtection'],  # with their subclasses
+        'endpoints': {},  # implicit method name -> the settings that differ for it
+    }
+    retry_stats = None
+    monotonicNonce = False  # raise the nonce() of the exchange above the last one of the api key, for counter or millisecond nonces
+    nonceSource = None  # an object with next(nonce), or a file shared by the processes with the same api key
+    nonce_clock = None
+    sharedRateLimiter = None  # a SharedTokenBucket, or its file, to share the rateLimit with other processes
 
     def __init__(self, config={}):
 
@@ -201,13 +260,29 @@ class Exchange(object):
 
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
+        settings = self.describe_settings()
 
+        # describe() is merged into the class defaults once per class, the settings that are
+        # overridden by the config or modified in run-time are copied for every instance
         for key in settings:
-            if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
-            else:
-                setattr(self, key, settings[key])
+            value = settings[key]
+            if key in config:
+                value = self.deep_extend(copy.deepcopy(value), config[key])
+            elif key in self.mutableSettings:
+                value = copy.deepcopy(value)
+            setattr(self, key, value)
+
+        # the class defaults of the mutable settings that describe() leaves out, like options = {}
+        for key in self.mutableSettings:
+            if (key not in settings) and (key not in config) and isinstance(getattr(self, key, None), dict):
+                setattr(self, key, copy.deepcopy(getattr(self, key)))
+
+        for key in config:
+            if key not in settings:
+                if hasattr(self, key) and isinstance(getattr(self, key), dict):
+                    setattr(self, key, self.deep_extend(getattr(self, key), config[key]))
+                else:
+                    setattr(self, key, config[key])
 
         if self.api:
             self.define_rest_api(self.api, 'request')
@@ -215,13 +290,6 @@ class Exchange(object):
         if self.markets:
             self.set_markets(self.markets)
 
-        # format camel case
-        for attr in dir(self):
-            if attr[0] != '_'and attr[-1] != '_' and '_' in attr:
-                conv = attr.split('_')
-                camel_case = conv[0] + ''.join(i[0].upper() + i[1:] for i in conv[1:])
-                setattr(self, camel_case, getattr(self, attr))
-
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit,
             'delay': 1.0,
@@ -230,6 +298,37 @@ class Exchange(object):
             'maxCapacity': 1000,
         }, getattr(self, 'tokenBucket') if hasattr(self, 'tokenBucket') else {})
 
+        if self.monotonicNonce:
+            if isinstance(self.nonceSource, basestring):
+                self.nonceSource = FileNonce(self.nonceSource)
+            # the nonce() of the exchange or the one given in the config keeps its units
+            self.nonce_clock = self.nonce
+            self.nonce = self.monotonic_nonce
+
+        if isinstance(self.sharedRateLimiter, basestring):
+            self.sharedRateLimiter = SharedTokenBucket(self.sharedRateLimiter)
+
+        if self.rateLimitHeaders:
+            self.rate_limit_budget = RateLimitBudget(self.rateLimitHeaders)
+
+        self.responseCache = ResponseCache(self.cacheMaxSize)
+
+        self.retry_stats = {
+            'requests': 0,  # the requests the retry policy applies to
+            'retries': 0,
+            'recovered': 0,  # the requests that succeeded after retrying
+            'failed': 0,
+            'backoff': 0,  # milliseconds spent waiting between the attempts
+            'latency': 0,  # milliseconds from the first attempt to the outcome, summed over the requests
+        }
+
+        self.codec = get_json_codec(self.jsonCodec)
+        if self.codec is not json_codec:
+            # the config overrides the default codec of the static json() and unjson() for this instance
+            codec = self.codec
+            self.unjson = codec.loads
+            self.json = lambda data, params=None: codec.dumps(data)
+
         self.session = self.session if self.session else Session()
 
     def __del__(self):
@@ -239,11 +338,83 @@ class Exchange(object):
     def describe(self):
         return {}
 
+    def describe_settings(self):
+        """The describe() output merged into the defaults of the class, computed once per class"""
+        cls = type(self)
+        settings = cls.__dict__.get('described_settings')
+        if settings is None:
+            description = self.describe()
+            settings = {}
+            for key in description:
+                default = getattr(cls, key, None)
+                settings[key] = self.deep_extend(default, description[key]) if isinstance(default, dict) else description[key]
+            setattr(cls, 'described_settings', settings)
+        return settings
+
+    def __getattr__(self, name):
+        """Bind the implicit api methods and resolve the camelcase aliases on first access"""
+        if name[0] == '_':
+            raise AttributeError(name)
+        cls = type(self)
+        implicit_methods = self.implicit_methods
+        if implicit_methods and (name in implicit_methods):
+            method_name, path, api_type, http_method = implicit_methods[name]
+            value = functools.partial(getattr(self, method_name), path, api_type, http_method)
+            self.__dict__[name] = value
+            return value
+        attr = cls.camelcase_aliases().get(name)
+        if attr is not None:
+            value = getattr(self, attr)
+            if callable(getattr(cls, attr)):
+                self.__dict__[name] = value  # methods are cached, attributes are read every time
+            return value
+        # attributes set on the instance, like those from the config
+        underscore = Exchange.camelcase_to_underscore(name)
+        if (underscore != name) and (underscore in self.__dict__):
+            return self.__dict__[underscore]
+        raise AttributeError("'" + cls.__name__ + "' object has no attribute '" + name + "'")
+
+    @classmethod
+    def camelcase_aliases(cls):
+        """A map of camelCase names to the underscored attributes of the class, built once per class"""
+        aliases = cls.__dict__.get('camelcase_alias_map')
+        if aliases is None:
+            aliases = {}
+            for attr in dir(cls):
+                if attr[0] != '_' and attr[-1] != '_' and '_' in attr:
+                    conv = attr.split('_')
+                    aliases[conv[0] + ''.join(i[0].upper() + i[1:] for i in conv[1:] if i)] = attr
+            setattr(cls, 'camelcase_alias_map', aliases)
+        return aliases
+
+    @staticmethod
+    def camelcase_to_underscore(name):
+        return re.sub('([A-Z])', lambda match: '_' + match.group(1).lower(), name)
+
     def define_rest_api(self, api, method_name, options={}):
+        """Register the implicit api methods, they are bound on first access by __getattr__"""
+        cls = type(self)
+        if api is not self.describe_settings().get('api'):
+            # an api of the config or given in run-time is compiled for this instance only
+            self.endpoints, self.implicit_methods = Exchange.compile_rest_api(api, method_name, options)
+            return
+        # the endpoint table of the described api is compiled once per class and shared by its instances
+        compiled = cls.__dict__.get('compiled_rest_api')
+        if (compiled is None) or (compiled[0] != (method_name, options)):
+            compiled = ((method_name, options),) + Exchange.compile_rest_api(api, method_name, options)
+            setattr(cls, 'compiled_rest_api', compiled)
+        self.endpoints, self.implicit_methods = compiled[1], compiled[2]
+
+    @staticmethod
+    def compile_rest_api(api, method_name, options={}):
         delimiters = re.compile('[^a-zA-Z0-9]')
+        endpoints = {}  # (api type, http method, path) -> names and rate limiter cost
+        implicit_methods = {}  # camelcase and underscore names -> (method name, path, api type, http method)
         for api_type, methods in api.items():
             for http_method, urls in methods.items():
+                # paths are either a list or a dict of path -> rate limiter cost
                 for url in urls:
+                    config = urls[url] if isinstance(urls, dict) else None
                     url = url.strip()
                     split_path = delimiters.split(url)
 
@@ -263,9 +434,16 @@ class Exchange(object):
                         if 'underscore' in options['suffixes']:
                             underscore += options['suffixes']['underscore']
 
-                    partial = functools.partial(getattr(self, method_name), url, api_type, uppercase_method)
-                    setattr(self, camelcase, partial)
-                    setattr(self, underscore, partial)
+                    endpoints[(api_type, uppercase_method, url)] = {
+                        'camelcase': camelcase,
+                        'underscore': underscore,
+                        'cost': config,
+                    }
+
+                    implicit_method = (method_name, url, api_type, uppercase_method)
+                    implicit_methods[camelcase] = implicit_method
+                    implicit_methods[underscore] = implicit_method
+        return endpoints, implicit_methods
 
     def raise_error(self, exception_type, url, method='GET', error=None, details=None):
         details = details if details else ''
@@ -291,23 +469,205 @@ class Exchange(object):
         else:
             raise exception_type(' '.join([self.id, method, url, details]))
 
-    def throttle(self):
+    def throttle(self, cost=None):
+        cost = self.tokenBucket['defaultCost'] if cost is None else cost
         now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        if elapsed < self.rateLimit:
-            delay = self.rateLimit - elapsed
+        if self.rateLimitPausedUntil > now:
+            time.sleep((self.rateLimitPausedUntil - now) / 1000.0)
+            now = float(self.milliseconds())
+        # the budget reported by the exchange allows a burst or asks to wait for the next window
+        delay = self.rate_limit_budget.delay(cost, now) if self.rate_limit_budget else None
+        if delay is None:
+            if self.sharedRateLimiter:
+                delay = self.sharedRateLimiter.acquire(cost, self.effective_rate_limit(), self.tokenBucket['capacity'])
+            else:
+                # the cost is paid after the request, like the token debt of the async bucket,
+                # the next request waits for as long as the previous one costs
+                elapsed = now - self.lastRestRequestTimestamp
+                delay = self.effective_rate_limit() * self.lastRestRequestCost - elapsed
+        if delay > 0:
             time.sleep(delay / 1000.0)
+        self.lastRestRequestCost = cost
+        if self.rate_limit_budget:
+            self.rate_limit_budget.spend(cost)
+
+    def effective_rate_limit(self):
+        """Milliseconds per unit of cost in effect, rateLimit unless the adaptive rate limit has slowed down"""
+        return self.rateLimit / self.rateLimitFactor
+
+    def decrease_rate_limit(self, retry_after=None):
+        """Cut the rate multiplicatively and pause for retry_after milliseconds if given"""
+        config = self.adaptiveRateLimit
+        self.rateLimitFactor = max(config['minFactor'], self.rateLimitFactor * config['decrease'])
+        self.rateLimitSuccesses = 0
+        self.update_rate_limiter(retry_after)
+
+    def increase_rate_limit(self):
+        """Regain the rate additively after a run of successful requests"""
+        if self.rateLimitFactor >= 1.0:
+            return
+        config = self.adaptiveRateLimit
+        self.rateLimitSuccesses += 1
+        if self.rateLimitSuccesses >= config['successes']:
+            self.rateLimitSuccesses = 0
+            self.rateLimitFactor = min(1.0, self.rateLimitFactor + config['increase'])
+            self.update_rate_limiter()
+
+    def update_rate_limiter(self, pause=None):
+        if self.rate_limit_budget:
+            self.rate_limit_budget.burst = self.rateLimitFactor >= 1.0
+        if pause:
+            self.rateLimitPausedUntil = max(self.rateLimitPausedUntil, self.milliseconds() + pause)
+            if self.sharedRateLimiter:
+                self.sharedRateLimiter.pause(pause)
+
+    @staticmethod
+    def retry_after(headers):
+        """Milliseconds to wait as requested by the Retry-After header in seconds or as a date, or None"""
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return max(0, int(float(value) * 1000))
+        except ValueError:
+            pass
+        date = email.utils.parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0, int((email.utils.mktime_tz(date) - time.time()) * 1000))
+
+    def calculate_rate_limiter_cost(self, api, method, path, params):
+        """The cost of an endpoint as declared in describe()['api'], None for the default cost"""
+        endpoint = self.endpoints.get((api, method, path)) if self.endpoints else None
+        config = endpoint['cost'] if endpoint else None
+        if config is None or isinstance(config, Number):
+            return config
+        cost = config['cost'] if 'cost' in config else None
+        if ('noSymbol' in config) and ('symbol' not in params):
+            cost = config['noSymbol']
+        if ('byLimit' in config) and ('limit' in params):
+            limit = float(params['limit'])
+            for [max_limit, limit_cost] in config['byLimit']:
+                if limit <= max_limit:
+                    cost = limit_cost
+                    break
+        return cost
+
+    def response_cache_ttl(self, api, method, path):
+        """Milliseconds to cache the responses of a GET endpoint for, as configured in cacheTTL"""
+        if not self.cacheTTL or (method != 'GET'):
+            return None
+        endpoint = self.endpoints.get((api, method, path)) if self.endpoints else None
+        if not endpoint:
+            return None
+        return self.cacheTTL.get(endpoint['camelcase'], self.cacheTTL.get(endpoint['underscore']))
 
     def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
-        """A better wrapper over request for deferred signing"""
+        """A better wrapper over request for deferred signing, retrying the transient errors"""
+        policy = self.retry_policy(api, method, path)
+        if not policy:
+            return self.fetch_once(path, api, method, params, headers, body)
+        self.retry_stats['requests'] += 1
+        start = self.milliseconds()
+        retries = 0
+        delay = policy['baseDelay']
+        while True:
+            try:
+                # every attempt is signed again and waits for its turn in the rate limiter
+                response = self.fetch_once(path, api, method, params, headers, body)
+                break
+            except BaseError as e:
+                delay = self.retry_delay(policy, retries, delay, e, self.milliseconds() - start)
+                if delay is None:
+                    self.retry_stats['failed'] += 1
+                    self.retry_stats['latency'] += self.milliseconds() - start
+                    raise
+                if self.verbose:
+                    print(self.id, method, path, 'retrying in', int(delay), 'ms after', type(e).__name__)
+                retries += 1
+                self.retry_stats['retries'] += 1
+                self.retry_stats['backoff'] += delay
+                time.sleep(delay / 1000.0)
+        if retries:
+            self.retry_stats['recovered'] += 1
+        self.retry_stats['latency'] += self.milliseconds() - start
+        return response
+
+    def retry_policy(self, api, method, path):
+        """The retry settings of an endpoint, None if its requests are not retried"""
+        policy = self.retryPolicy
+        endpoint = self.endpoints.get((api, method, path)) if self.endpoints else None
+        if endpoint and policy['endpoints']:
+            overrides = policy['endpoints'].get(endpoint['camelcase'], policy['endpoints'].get(endpoint['underscore']))
+            if overrides:
+                policy = self.extend(policy, overrides)
+        if not policy['maxRetries'] or (api not in policy['apis']) or (method not in policy['methods']):
+            return None
+        return policy
+
+    def retry_delay(self, policy, retries, previous, error, elapsed):
+        """Milliseconds to wait before the next attempt, None to give up"""
+        if retries >= policy['maxRetries']:
+            return None
+        if not any(cls.__name__ in policy['errors'] for cls in type(error).__mro__):
+            return None
+        # decorrelated jitter, a random delay from the base up to three times the previous one
+        delay = min(policy['maxDelay'], random.uniform(policy['baseDelay'], previous * 3))
+        retry_after = self.retry_after(self.last_response_headers)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if elapsed + delay > policy['timeBudget']:
+            return None
+        return delay
+
+    def fetch_once(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        cost = self.calculate_rate_limiter_cost(api, method, path, params)
+        ttl = self.response_cache_ttl(api, method, path)
+        if ttl:
+            request = self.sign(path, api, method, params, headers, body)
+            # cached responses are stored serialized, so that callers cannot alter them
+            cached = self.responseCache.get((request['method'], request['url'], request['body']))
+            if cached is not None:
+                return self.unjson(cached)
+            return self.fetch_request(request, cost, ttl)
         if self.enableRateLimit:
-            self.throttle()
+            self.throttle(cost)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        return self.send_request(request, cost)
 
-    def request(self, path, api='public', method='GET', params={}, headers=None, body=None, proxy=''):
-        return self.fetch2(path, api, method, params, headers, body, proxy)
+    def fetch_request(self, request, cost=None, ttl=None):
+        """Throttle and perform a request that is already signed, caching the response for ttl milliseconds"""
+        if self.enableRateLimit:
+            self.throttle(cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        response = self.send_request(request, cost)
+        if ttl:
+            self.responseCache.set((request['method'], request['url'], request['body']), self.json(response), ttl)
+        return response
+
+    def send_request(self, request, cost=None):
+        """Perform a signed request, adapting the rate limit to the pushback of the exchange"""
+        adaptive = self.adaptiveRateLimit['enabled']
+        try:
+            response = self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except BaseError as e:
+            if adaptive:
+                retry_after = self.retry_after(self.last_response_headers)
+                if isinstance(e, DDoSProtection) or (retry_after is not None):
+                    self.decrease_rate_limit(retry_after)
+            raise
+        finally:
+            if self.rate_limit_budget:
+                # the headers count the request itself, not the others still in flight
+                self.rate_limit_budget.release(self.tokenBucket['defaultCost'] if cost is None else cost)
+                self.rate_limit_budget.update(self.last_response_headers)
+        if adaptive:
+            self.increase_rate_limit()
+        return response
+
+    def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return self.fetch2(path, api, method, params, headers, body)
 
     @staticmethod
     def gzip_deflate(response, text):
@@ -349,6 +709,7 @@ class Exchange(object):
         self.session.cookies.clear()
 
         response = None
+        self.last_response_headers = None
         try:
             response = self.session.request(
                 method,
@@ -358,6 +719,7 @@ class Exchange(object):
                 timeout=int(self.timeout / 1000),
                 proxies=self.proxies
             )
+            self.last_response_headers = response.headers
             self.last_http_response = response.text
             response.raise_for_status()
 
@@ -406,10 +768,12 @@ class Exchange(object):
         if error:
             self.raise_error(error, url, method, exception if exception else http_status_code, response)
 
-    def handle_rest_response(self, response, url, method='GET', headers=None, body=None):
+    def handle_rest_response(self, response, url, method='GET', headers=None, body=None, response_bytes=None):
+        """Decode the response text, or the raw response bytes if they are given"""
         try:
             if self.parseJsonResponse:
-                self.last_json_response = json.loads(response) if len(response) > 1 else None
+                data = response if response_bytes is None else response_bytes
+                self.last_json_response = self.codec.loads(data) if len(response) > 1 else None
                 return self.last_json_response
             else:
                 return response
@@ -750,11 +1114,11 @@ class Exchange(object):
 
     @staticmethod
     def unjson(input):
-        return json.loads(input)
+        return json_codec.loads(input)
 
     @staticmethod
     def json(data, params=None):
-        return json.dumps(data, separators=(',', ':'))
+        return json_codec.dumps(data)
 
     @staticmethod
     def encode(string):
@@ -771,6 +1135,11 @@ class Exchange(object):
     def nonce(self):
         return Exchange.seconds()
 
+    def monotonic_nonce(self):
+        """The nonce() of the exchange, increased if needed to stay above the last one of the api key"""
+        source = self.nonceSource or get_nonce_source(str(self.id) + ':' + str(self.apiKey))
+        return source.next(self.nonce_clock())
+
     def check_required_credentials(self):
         keys = list(self.requiredCredentials.keys())
         for key in keys:
@@ -853,12 +1222,39 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            if self.marketsCache['enabled']:
+                markets = self.load_cached_markets()
+                if markets is not None:
+                    return markets
         markets = self.fetch_markets()
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = self.fetch_currencies()
+        if self.marketsCache['enabled']:
+            self.get_markets_cache().save(markets, currencies)
         return self.set_markets(markets, currencies)
 
+    def get_markets_cache(self):
+        settings = {
+            'api': self.urls.get('api'),
+            'options': self.options,
+        }
+        return MarketCache(self.id, self.marketsCache['path'], __version__, settings)
+
+    def load_cached_markets(self):
+        """Set the markets from the local cache, an expired cache is refreshed on the calling thread"""
+        cached = self.get_markets_cache().load()
+        if cached is None:
+            return None
+        if MarketCache.is_expired(cached, self.marketsCache['maxAge']):
+            try:
+                return self.load_markets(True)
+            except BaseError as e:
+                # the expired markets are still better than none
+                if self.verbose:
+                    print(self.id, 'markets cache refresh failed:', str(e))
+        return self.set_markets(cached['markets'], cached['currencies'])
+
     def populate_fees(self):
         if not (hasattr(self, 'markets') or hasattr(self, 'currencies')):
             return
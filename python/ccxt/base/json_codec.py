@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""JSON encoding and decoding with orjson, ujson or the standard library"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+__all__ = [
+    'JsonCodec',
+    'get_json_codec',
+]
+
+# -----------------------------------------------------------------------------
+
+_codecs = {}
+
+
+def get_json_codec(name='auto'):
+    """The shared codec for 'orjson', 'ujson', 'json' or 'auto', the fastest one installed"""
+    if name not in _codecs:
+        _codecs[name] = JsonCodec(name)
+    return _codecs[name]
+
+# -----------------------------------------------------------------------------
+
+
+class JsonCodec(object):
+    """Falls back to the standard library for the input the faster libraries reject,
+    like integers wider than 64 bits, NaN or non-string keys"""
+
+    def __init__(self, name='auto'):
+        if name == 'auto':
+            name = 'orjson' if orjson else ('ujson' if ujson else 'json')
+        if (name == 'orjson' and not orjson) or (name == 'ujson' and not ujson):
+            raise ImportError(name + ' is not installed')
+        if name not in ('orjson', 'ujson', 'json'):
+            raise ValueError('unknown json codec ' + name)
+        self.name = name
+        self.ujson_options = {}
+        if name == 'ujson':
+            try:
+                ujson.loads('0.1', precise_float=True)  # ujson 1.x parses floats approximately by default
+                self.ujson_options = {'precise_float': True}
+            except TypeError:
+                pass
+
+    def loads(self, data):
+        """Decode a str or a utf-8 bytes object"""
+        if self.name == 'orjson':
+            try:
+                return orjson.loads(data)
+            except ValueError:
+                pass
+        elif self.name == 'ujson':
+            try:
+                return ujson.loads(data, **self.ujson_options)
+            except (ValueError, OverflowError):
+                pass
+        if isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')  # json.loads accepts bytes from Python 3.6 on
+        return json.loads(data)
+
+    def dumps(self, data):
+        """Encode to a compact str"""
+        if self.name == 'orjson':
+            try:
+                return orjson.dumps(data).decode('utf-8')
+            except (TypeError, OverflowError):
+                pass
+        # ujson rounds floats to 9 digits when encoding, in the versions that do not
+        # support double_precision=17, so only its decoder is used
+        return json.dumps(data, separators=(',', ':'))
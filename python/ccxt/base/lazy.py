@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Import the exchange classes of a package on first access instead of at import time"""
+
+import importlib
+import sys
+import types
+
+__all__ = [
+    'lazy_attributes',
+]
+
+# -----------------------------------------------------------------------------
+
+
+def lazy_attributes(package_name, attributes):
+    """Resolve package attributes from {name: module name} when they are first read
+
+    Each name gets a property on the class of the package module, it takes precedence
+    over the submodule which the import system binds to the package under the same name.
+    Any other value assigned to a name, like a mock, is kept in the module __dict__ and
+    takes precedence over the property until it is deleted.
+    """
+    package = sys.modules[package_name]
+
+    def lazy_property(name, module_name):
+        def get(module):
+            if name in module.__dict__:
+                return module.__dict__[name]
+            return getattr(importlib.import_module(module_name), name)
+
+        def set(module, value):
+            if isinstance(value, types.ModuleType) and (value.__name__ == package_name + '.' + name):
+                return  # the import system binds ccxt.binance the module, ccxt.binance is the class
+            module.__dict__[name] = value
+
+        def delete(module):
+            if name not in module.__dict__:
+                raise AttributeError(name)
+            del module.__dict__[name]
+
+        return property(get, set, delete)
+
+    def lazy_dir(module):
+        return sorted(set(module.__dict__) | set(attributes))
+
+    properties = dict((name, lazy_property(name, module_name)) for name, module_name in attributes.items())
+    properties['__dir__'] = lazy_dir
+    try:
+        package.__class__ = type('LazyPackage', (types.ModuleType,), properties)
+    except TypeError:
+        # Python < 3.5 cannot change the class of a module, import everything right away
+        for name, module_name in attributes.items():
+            setattr(package, name, getattr(importlib.import_module(module_name), name))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""A local file cache of the fetch_markets/fetch_currencies output of an exchange"""
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+__all__ = [
+    'MarketCache',
+]
+
+# -----------------------------------------------------------------------------
+
+
+def default_path():
+    # a folder of the user, the files of another user of a shared temporary folder are never read
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'ccxt')
+
+
+def settings_hash(settings):
+    data = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[0:16]
+
+# -----------------------------------------------------------------------------
+
+
+class MarketCache(object):
+    """One versioned json file per exchange id and settings
+
+    The settings, like the api urls and the options of the exchange, are hashed
+    into the name of the file, so a sandbox or another market type has a cache of
+    its own. Files that are not owned by the current user are ignored.
+    """
+
+    version = 1  # bump when the format of the file changes
+
+    def __init__(self, exchange_id, path=None, library_version=None, settings=None):
+        self.path = path or default_path()
+        name = 'ccxt-markets-' + exchange_id
+        if settings is not None:
+            name += '-' + settings_hash(settings)
+        self.filename = os.path.join(self.path, name + '.json')
+        self.library_version = library_version
+
+    def load(self):
+        """The cached entry, or None if there is no usable one"""
+        try:
+            with open(self.filename, 'r') as f:
+                if hasattr(os, 'getuid') and (os.fstat(f.fileno()).st_uid != os.getuid()):
+                    return None  # planted by another user
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        # markets parsed by another version of the library may have another structure
+        if (entry.get('version') != self.version) or (entry.get('libraryVersion') != self.library_version):
+            return None
+        if ('markets' not in entry) or ('timestamp' not in entry):
+            return None
+        return entry
+
+    def save(self, markets, currencies=None):
+        entry = {
+            'version': self.version,
+            'libraryVersion': self.library_version,
+            'timestamp': int(time.time() * 1000),
+            'markets': markets,
+            'currencies': currencies,
+        }
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError):
+            return False
+        # write to a temporary file first, so that readers never see a partial file
+        folder = self.path
+        try:
+            os.makedirs(folder, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                return False
+        try:
+            fd, temporary = tempfile.mkstemp(dir=folder, prefix='.ccxt-markets-')
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            if hasattr(os, 'replace'):
+                os.replace(temporary, self.filename)  # Python 3
+            else:
+                os.rename(temporary, self.filename)  # Python 2
+        except (IOError, OSError):
+            return False
+        return True
+
+    @staticmethod
+    def is_expired(entry, max_age):
+        return int(time.time() * 1000) - entry['timestamp'] >= max_age
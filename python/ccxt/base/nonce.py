@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""Strictly increasing nonces for the private requests of an api key"""
+
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'FileNonce',
+    'MonotonicNonce',
+    'get_nonce_source',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class MonotonicNonce(object):
+    """Raises a nonce to one above the last one when the clock has not moved on
+
+    The value keeps the units of the nonce() of the exchange, so with a nonce in
+    seconds a burst of requests runs ahead of the clock by one per request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last = None
+
+    def next(self, value):
+        with self.lock:
+            if (self.last is not None) and (value <= self.last):
+                value = self.last + 1
+            self.last = value
+            return value
+
+# -----------------------------------------------------------------------------
+
+
+class FileNonce(MonotonicNonce):
+    """The last nonce is kept in a file, for the processes that share an api key
+
+    The file is locked with flock for the read and the write of the counter, which
+    takes a few microseconds, the threads of a process also take the thread lock.
+    A forked process opens the file again, a flock is held by the open file and
+    would not exclude the parent if the child used the one it inherited.
+    """
+
+    counter = struct.Struct('<q')
+
+    def __init__(self, filename):
+        if fcntl is None:
+            raise NotSupported('FileNonce needs fcntl, which is not available on this platform')
+        super(FileNonce, self).__init__()
+        self.filename = filename
+        self.open()
+
+    def open(self):
+        self.pid = os.getpid()
+        self.fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def next(self, value):
+        if self.pid != os.getpid():
+            self.lock = threading.Lock()  # it may have been held by another thread at the time of the fork
+            self.open()  # the inherited descriptor is left to the parent
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                data = os.read(self.fd, self.counter.size)
+                if len(data) == self.counter.size:
+                    last = self.counter.unpack(data)[0]
+                    if value <= last:
+                        value = last + 1
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                os.write(self.fd, self.counter.pack(int(value)))
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.last = value
+            return value
+
+    def close(self):
+        os.close(self.fd)
+
+# -----------------------------------------------------------------------------
+
+
+sources = {}
+sources_lock = threading.Lock()
+
+
+def get_nonce_source(key):
+    """The MonotonicNonce shared by the instances of the process with the same key"""
+    source = sources.get(key)
+    if source is None:
+        with sources_lock:
+            source = sources.setdefault(key, MonotonicNonce())
+    return source
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""The request budget an exchange reports in its response headers"""
+
+from numbers import Number
+import time
+
+__all__ = [
+    'RateLimitBudget',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class RateLimitBudget(object):
+    """The budget left in the current window, in the units of the rate limiter costs
+
+    Configured by describe()['rateLimitHeaders']:
+
+        'used'       the header with the budget used in the window, like X-MBX-USED-WEIGHT
+        'remaining'  the header with the budget left in the window, like X-RateLimit-Remaining
+        'limit'      the budget of a window, a number or a header like X-RateLimit-Limit
+        'reset'      the header with the end of the window, in seconds from now or as a unix timestamp
+        'interval'   milliseconds, the length of the windows aligned to the clock if there is no reset header
+        'reserve'    the fraction of the limit spent at the rateLimit pace instead of in bursts
+
+    The cost of the requests in flight, charged by the rate limiter and not answered
+    yet, is subtracted from what the exchange reports, which does not count them yet.
+    Every response corrects the estimate.
+    """
+
+    def __init__(self, config):
+        self.config = {
+            'used': None,
+            'remaining': None,
+            'limit': None,
+            'reset': None,
+            'interval': None,
+            'reserve': 0.1,
+        }
+        self.config.update(config)
+        self.limit = self.config['limit'] if isinstance(self.config['limit'], Number) else None
+        self.remaining = None  # None until a response tells
+        self.reset = None  # milliseconds, the end of the current window
+        self.burst = True  # turned off while the adaptive rate limit has slowed down
+        self.in_flight = 0  # the cost of the requests sent and not answered yet
+
+    @staticmethod
+    def milliseconds():
+        return time.time() * 1000
+
+    @staticmethod
+    def header(headers, name):
+        value = headers.get(name) if name else None
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def update(self, headers, now=None):
+        """Read the budget from the headers of a response, returns False if they do not have it"""
+        if not headers:
+            return False
+        now = self.milliseconds() if now is None else now
+        config = self.config
+        if not isinstance(config['limit'], Number):
+            self.limit = self.header(headers, config['limit']) or self.limit
+        remaining = self.header(headers, config['remaining'])
+        used = self.header(headers, config['used'])
+        if (remaining is None) and (used is not None) and (self.limit is not None):
+            remaining = self.limit - used
+        if remaining is None:
+            return False
+        reset = self.header(headers, config['reset'])
+        if reset is not None:
+            if reset < 1e9:
+                reset = now + reset * 1000  # seconds from now
+            elif reset < 1e12:
+                reset = reset * 1000  # a timestamp in seconds, otherwise in milliseconds
+        elif config['interval']:
+            reset = (now // config['interval'] + 1) * config['interval']
+        self.remaining = remaining - self.in_flight
+        self.reset = reset
+        return True
+
+    def spend(self, cost):
+        """Charge a request that is sent now"""
+        self.in_flight += cost
+        if self.remaining is not None:
+            self.remaining -= cost
+
+    def release(self, cost):
+        """A request charged before is answered or has failed, before the headers of its response are read"""
+        self.in_flight = max(0, self.in_flight - cost)
+
+    def delay(self, cost, now=None):
+        """Milliseconds to wait before spending cost, 0 to send it right away in a burst,
+        or None to keep the rateLimit pace when the budget is unknown or in the reserve"""
+        if self.remaining is None:
+            return None
+        now = self.milliseconds() if now is None else now
+        if (self.reset is not None) and (now >= self.reset):
+            # a new window has started
+            interval = self.config['interval']
+            if (self.limit is None) or not interval:
+                self.remaining = None
+                self.reset = None
+                return None
+            self.remaining = self.limit
+            self.reset = (now // interval + 1) * interval
+        reserve = self.config['reserve'] * self.limit if self.limit else 0
+        if self.remaining - cost >= reserve:
+            return 0 if self.burst else None
+        if self.remaining - cost >= 0:
+            return None
+        return (self.reset - now) if self.reset is not None else None
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""A size-bounded LRU cache of REST responses with a TTL per entry"""
+
+import collections
+import time
+
+__all__ = [
+    'ResponseCache',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class ResponseCache(object):
+    """LRU cache with expiring entries and hit/miss/eviction counters"""
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()  # key -> (expiration time, value), oldest first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entry = self.entries.pop(key, None)
+        if (entry is None) or (entry[0] <= time.time()):
+            self.misses += 1
+            return default
+        self.entries[key] = entry  # move to the most recently used end
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        """Store a value for ttl milliseconds, evicting the least recently used entries"""
+        self.entries.pop(key, None)
+        self.entries[key] = (time.time() + ttl / 1000.0, value)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'maxSize': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""Order books published by one process into shared memory for other processes to read"""
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'SharedOrderBookReader',
+    'SharedOrderBookWriter',
+]
+
+# -----------------------------------------------------------------------------
+#
+# The file is mapped into the memory of the writer and of every reader. It has
+# a header and one slot per symbol holding the best depth levels of each side:
+#
+#     header  magic, version, slots, depth
+#     slot    sequence, symbol, timestamp, number of bids, number of asks,
+#             depth bids as price, amount, depth asks as price, amount
+#
+# Each slot is guarded by a seqlock: the writer makes the sequence odd before
+# changing the slot and even again afterwards. A reader unpacks the slot straight
+# from the mapping and retries if the sequence was odd or changed meanwhile, so
+# neither side ever waits for a lock and the writer is never held back by readers.
+# CPython copies the fields with plain stores, which keep their order on x86.
+
+MAGIC = b'CCXTSOB1'
+VERSION = 1
+HEADER = struct.Struct('<8sIII')
+HEADER_SIZE = 64
+SEQUENCE = struct.Struct('<Q')
+SYMBOL_SIZE = 32
+
+# -----------------------------------------------------------------------------
+
+
+def default_path():
+    # /dev/shm keeps the file in memory on Linux, elsewhere the page cache does
+    return '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+def book_filename(name, path=None):
+    return os.path.join(path or default_path(), 'ccxt-orderbooks-' + name)
+
+
+def slot_struct(depth):
+    return struct.Struct('<' + str(SYMBOL_SIZE) + 'sdII' + str(depth * 4) + 'd')
+
+
+def iso8601(timestamp):
+    if timestamp is None:
+        return None
+    seconds = int(timestamp // 1000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + '.{:03d}Z'.format(int(timestamp) % 1000)
+
+# -----------------------------------------------------------------------------
+
+
+class SharedOrderBookWriter(object):
+    """Publishes the top of the books of one process, symbols take the free slots in turn
+
+    The file is created anew, readers opened before a restart of the writer keep
+    the old file and need to be opened again.
+    """
+
+    def __init__(self, name, slots=64, depth=25, path=None):
+        self.filename = book_filename(name, path)
+        self.slots = slots
+        self.depth = depth
+        self.body = slot_struct(depth)
+        self.slot_size = SEQUENCE.size + self.body.size
+        self.offsets = {}  # symbol -> the offset of its slot
+        size = HEADER_SIZE + slots * self.slot_size
+        # the file is replaced as a whole, so that a reader never maps a truncated file
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(self.filename), prefix='.ccxt-orderbooks-')
+        try:
+            os.ftruncate(fd, size)
+            self.mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        HEADER.pack_into(self.mmap, 0, MAGIC, VERSION, slots, depth)
+        if hasattr(os, 'replace'):
+            os.replace(temporary, self.filename)  # Python 3
+        else:
+            os.rename(temporary, self.filename)  # Python 2
+
+    def slot(self, symbol):
+        offset = self.offsets.get(symbol)
+        if offset is None:
+            if len(self.offsets) >= self.slots:
+                raise NotSupported('no free slot for ' + symbol + ' in ' + self.filename)
+            if len(symbol.encode('utf-8')) > SYMBOL_SIZE:
+                raise NotSupported('symbol ' + symbol + ' is longer than ' + str(SYMBOL_SIZE) + ' bytes')
+            offset = self.offsets[symbol] = HEADER_SIZE + len(self.offsets) * self.slot_size
+        return offset
+
+    def write(self, symbol, bids, asks, timestamp=None):
+        """Publish the best levels of each side as lists of [price, amount]"""
+        offset = self.slot(symbol)
+        depth = self.depth
+        bids = bids[:depth]
+        asks = asks[:depth]
+        values = [0.0] * (depth * 4)
+        i = 0
+        for price, amount in bids:
+            values[i] = price
+            values[i + 1] = amount
+            i += 2
+        i = depth * 2
+        for price, amount in asks:
+            values[i] = price
+            values[i + 1] = amount
+            i += 2
+        sequence = SEQUENCE.unpack_from(self.mmap, offset)[0]
+        SEQUENCE.pack_into(self.mmap, offset, sequence + 1)  # odd while the slot is being written
+        self.body.pack_into(self.mmap, offset + SEQUENCE.size, symbol.encode('utf-8'), -1.0 if timestamp is None else timestamp, len(bids), len(asks), *values)
+        SEQUENCE.pack_into(self.mmap, offset, sequence + 2)
+
+    def close(self):
+        self.mmap.close()
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+# -----------------------------------------------------------------------------
+
+
+class SharedOrderBookReader(object):
+    """Reads the books published by a SharedOrderBookWriter of the same name"""
+
+    def __init__(self, name, path=None, retries=10000):
+        self.filename = book_filename(name, path)
+        self.retries = retries
+        with open(self.filename, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.slots, self.depth = HEADER.unpack_from(self.mmap, 0)
+        if (magic != MAGIC) or (version != VERSION):
+            self.mmap.close()
+            raise ValueError(self.filename + ' is not a shared order book file of version ' + str(VERSION))
+        self.body = slot_struct(self.depth)
+        self.slot_size = SEQUENCE.size + self.body.size
+        self.offsets = {}  # symbol -> the offset of its slot
+
+    def symbols(self):
+        """The symbols published so far"""
+        result = []
+        for i in range(self.slots):
+            offset = HEADER_SIZE + i * self.slot_size
+            if not SEQUENCE.unpack_from(self.mmap, offset)[0]:
+                break  # the slots are taken in turn
+            symbol = self.read(offset)
+            if symbol is not None:
+                self.offsets[symbol[0]] = offset
+                result.append(symbol[0])
+        return result
+
+    def version(self, symbol):
+        """The sequence of the slot, which changes with every update, or None"""
+        offset = self.offsets.get(symbol)
+        if offset is None:
+            self.symbols()
+            offset = self.offsets.get(symbol)
+            if offset is None:
+                return None
+        return SEQUENCE.unpack_from(self.mmap, offset)[0]
+
+    def read(self, offset):
+        """A consistent copy of a slot as (symbol, timestamp, bids, asks), or None"""
+        body = self.body
+        for i in range(self.retries):
+            sequence = SEQUENCE.unpack_from(self.mmap, offset)[0]
+            if sequence & 1:
+                continue
+            values = body.unpack_from(self.mmap, offset + SEQUENCE.size)
+            if SEQUENCE.unpack_from(self.mmap, offset)[0] == sequence:
+                break
+        else:
+            return None  # the writer died in the middle of an update
+        symbol, timestamp, num_bids, num_asks = values[0:4]
+        levels = values[4:]
+        depth = self.depth * 2
+        bids = [[levels[j], levels[j + 1]] for j in range(0, num_bids * 2, 2)]
+        asks = [[levels[depth + j], levels[depth + j + 1]] for j in range(0, num_asks * 2, 2)]
+        return (symbol.rstrip(b'\0').decode('utf-8'), None if timestamp < 0 else timestamp, bids, asks)
+
+    def snapshot(self, symbol, limit=None):
+        """The book in the ccxt format, or None if the symbol has not been published"""
+        if self.version(symbol) is None:
+            return None
+        slot = self.read(self.offsets[symbol])
+        if slot is None:
+            return None
+        symbol, timestamp, bids, asks = slot
+        return {
+            'bids': bids if limit is None else bids[:limit],
+            'asks': asks if limit is None else asks[:limit],
+            'timestamp': timestamp,
+            'datetime': iso8601(timestamp),
+        }
+
+    def close(self):
+        self.mmap.close()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""A rate limiter shared by the processes that use one api key"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+
+from ccxt.base.errors import NotSupported
+
+__all__ = [
+    'SharedTokenBucket',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class SharedTokenBucket(object):
+    """The token bucket of an api key in a memory mapped file
+
+    The bucket is kept as the time at which it will be full again, the theoretical
+    arrival time of the generic cell rate algorithm. A request reserves its turn
+    under a flock of the file and then waits outside of it, so the processes are
+    served in the order they asked, and none of them waits while holding the lock.
+    A forked process opens the file again for the lock, a flock is held by the open
+    file, which the child would otherwise share with its parent.
+
+        bucket = SharedTokenBucket('/dev/shm/ccxt-binance-main')
+        exchange = ccxt.binance({'enableRateLimit': True, 'sharedRateLimiter': bucket})
+    """
+
+    state = struct.Struct('<8sdQd')  # magic, the time the bucket is full again, requests, milliseconds waited
+    magic = b'CCXTSTB1'
+
+    def __init__(self, filename):
+        if fcntl is None:
+            raise NotSupported('SharedTokenBucket needs fcntl, which is not available on this platform')
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self.fd).st_size < self.state.size:
+                os.ftruncate(self.fd, self.state.size)
+            self.mmap = mmap.mmap(self.fd, self.state.size)
+            if self.mmap[0:8] != self.magic:
+                self.state.pack_into(self.mmap, 0, self.magic, 0.0, 0, 0.0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def milliseconds():
+        # the wall clock is the one clock all processes agree on
+        return time.time() * 1000
+
+    def update(self, method, *args):
+        if self.pid != os.getpid():
+            # the shared mapping stays valid in the child, the lock needs a file of its own
+            self.lock = threading.Lock()
+            self.pid = os.getpid()
+            self.fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o600)
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                magic, full, requests, waited = self.state.unpack_from(self.mmap, 0)
+                full, requests, waited, result = method(self.milliseconds(), full, requests, waited, *args)
+                self.state.pack_into(self.mmap, 0, magic, full, requests, waited)
+                return result
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def acquire(self, cost=1.0, interval=1000.0, capacity=1.0):
+        """Reserve the next turn for a request of cost, returns the milliseconds to wait for it
+
+        interval is the rateLimit in milliseconds per unit of cost, up to capacity
+        units can be spent at once after a pause.
+        """
+        def reserve(now, full, requests, waited):
+            wait = max(0.0, full - now - (capacity - 1) * interval)
+            return max(full, now) + cost * interval, requests + 1, waited + wait, wait
+        return self.update(reserve)
+
+    def pause(self, milliseconds):
+        """Hold back all processes, as asked by a Retry-After header"""
+        def delay(now, full, requests, waited):
+            return max(full, now + milliseconds), requests, waited, None
+        self.update(delay)
+
+    def stats(self):
+        """The requests of all processes so far and the milliseconds they waited in total"""
+        def read(now, full, requests, waited):
+            return full, requests, waited, {'requests': requests, 'waited': waited, 'backlog': max(0.0, full - now)}
+        return self.update(read)
+
+    def close(self):
+        self.mmap.close()
+        os.close(self.fd)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+"""Helpers shared by the tests"""
+
+# ------------------------------------------------------------------------------
+
+
+def create_exchange(cls, config=None):
+    """An exchange of the class that records the urls it would fetch in exchange.requests,
+    every response is the url with the number of the request"""
+    exchange = cls(config or {})
+    exchange.requests = []
+
+    def fetch(url, method='GET', headers=None, body=None):
+        exchange.requests.append(url)
+        return {'url': url, 'number': len(exchange.requests)}
+
+    exchange.fetch = fetch
+    return exchange
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.async.base.exchange import Exchange  # noqa: E402
+import helpers  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class Coalescing(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Coalescing, self).describe(), {
+            'id': 'coalescing',
+            'api': {
+                'public': {'get': ['ticker']},
+                'private': {'post': ['order']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        url = '/' + api + '/' + path + '?' + self.urlencode(self.keysort(params))
+        return {'url': url, 'method': method, 'headers': headers, 'body': body}
+
+    async def fetch_markets(self):
+        self.requests.append('markets')
+        await asyncio.sleep(0.05)
+        return [{'id': 'BTCUSD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'}]
+
+
+def create_exchange(config=None):
+    exchange = helpers.create_exchange(Coalescing, config)
+    record = exchange.fetch
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        response = record(url, method, headers, body)
+        await asyncio.sleep(0.05)  # long enough for the identical requests to meet
+        return response
+
+    exchange.fetch = fetch
+    return exchange
+
+
+async def test_identical_public_requests():
+    exchange = create_exchange()
+    responses = await asyncio.gather(*[exchange.publicGetTicker({'symbol': 'BTCUSD'}) for i in range(10)])
+    # one round trip, every caller gets its response
+    assert exchange.requests == ['/public/ticker?symbol=BTCUSD']
+    assert all(response == responses[0] for response in responses)
+    assert exchange.pending_requests == {}
+    # other parameters are another request
+    await asyncio.gather(exchange.publicGetTicker({'symbol': 'BTCUSD'}), exchange.publicGetTicker({'symbol': 'ETHUSD'}))
+    assert len(exchange.requests) == 3
+    # the requests that are not in flight together are not coalesced
+    await exchange.publicGetTicker({'symbol': 'BTCUSD'})
+    assert len(exchange.requests) == 4
+    await exchange.close()
+
+
+async def test_private_requests():
+    exchange = create_exchange()
+    await asyncio.gather(*[exchange.privatePostOrder({'amount': 1}) for i in range(3)])
+    assert exchange.requests == ['/private/order?amount=1'] * 3
+    disabled = create_exchange({'enableRequestCoalescing': False})
+    await asyncio.gather(*[disabled.publicGetTicker() for i in range(3)])
+    assert len(disabled.requests) == 3
+    await exchange.close()
+    await disabled.close()
+
+
+async def test_cancelled_caller():
+    exchange = create_exchange()
+    first = asyncio.ensure_future(exchange.publicGetTicker())
+    second = asyncio.ensure_future(exchange.publicGetTicker())
+    await asyncio.sleep(0.01)
+    first.cancel()
+    # the request goes on for the other caller
+    assert (await second)['url'] == '/public/ticker?'
+    assert len(exchange.requests) == 1
+    await exchange.close()
+
+
+async def test_load_markets():
+    exchange = create_exchange()
+    markets = await asyncio.gather(*[exchange.load_markets() for i in range(5)])
+    assert exchange.requests == ['markets']
+    assert all(result is markets[0] for result in markets)
+    assert exchange.markets_loading is None
+    await exchange.load_markets()
+    assert exchange.requests == ['markets']
+    await exchange.load_markets(True)
+    assert exchange.requests == ['markets', 'markets']
+    await exchange.close()
+
+
+async def test_cached_markets():
+    path = tempfile.mkdtemp()
+    exchange = create_exchange({'urls': {'api': 'https://example.com'}, 'marketsCache': {'enabled': True, 'path': path, 'maxAge': 60000}})
+    cache = exchange.get_markets_cache()
+    cache.save([{'id': 'ETHUSD', 'symbol': 'ETH/USD', 'base': 'ETH', 'quote': 'USD'}])
+    with open(cache.filename, 'r') as f:
+        entry = json.load(f)
+    entry['timestamp'] -= 120000
+    with open(cache.filename, 'w') as f:
+        json.dump(entry, f)
+    # the expired markets are returned at once and refreshed in a task of the event loop
+    assert list(await exchange.load_markets()) == ['ETH/USD']
+    await asyncio.sleep(0.1)
+    assert exchange.requests == ['markets']
+    assert list(exchange.markets) == ['BTC/USD']
+    assert [market['symbol'] for market in cache.load()['markets']] == ['BTC/USD']
+    await exchange.close()
+    shutil.rmtree(path)
+
+
+async def main():
+    await test_identical_public_requests()
+    await test_private_requests()
+    await test_cancelled_caller()
+    await test_load_markets()
+    await test_cached_markets()
+    print('coalescing tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
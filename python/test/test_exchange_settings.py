@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_settings_are_copied_per_instance():
+    first = ccxt.gdax()
+    second = ccxt.gdax()
+    for key in ('urls', 'has', 'fees', 'options'):
+        assert getattr(first, key) is not getattr(second, key), key
+    # the settings that are not changed in run-time are shared read-only
+    assert first.api is second.api
+    assert first.timeframes is second.timeframes
+    api = second.urls['api']
+    maker = second.fees['trading']['maker']
+    first.urls['api'] = 'https://api-public.sandbox.gdax.com'
+    first.has['fetchTickers'] = 'emulated'
+    first.fees['trading']['maker'] = 0.5
+    first.options['adjustForTimeDifference'] = True
+    for exchange in (second, ccxt.gdax()):  # a new instance is not affected either
+        assert exchange.urls['api'] == api
+        assert exchange.has['fetchTickers'] != 'emulated'
+        assert exchange.fees['trading']['maker'] == maker
+        assert 'adjustForTimeDifference' not in exchange.options
+
+
+def test_markets_are_copied_per_instance():
+    first = ccxt.bitfinex()
+    second = ccxt.bitfinex()
+    markets = [{'id': 'BTCUSD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'}]
+    first.set_markets(markets)
+    first.markets['BTC/USD']['active'] = False
+    assert not second.markets
+
+
+def test_config_api_is_compiled_per_instance():
+    exchange = ccxt.gdax({'api': {'public': {'get': ['sandbox']}}})
+    assert exchange.api is not ccxt.gdax().api
+    assert callable(exchange.publicGetSandbox)
+    try:
+        ccxt.gdax().publicGetSandbox
+        assert False, 'the api of the config leaked to another instance'
+    except AttributeError:
+        pass
+
+
+def test_config_overrides_settings():
+    exchange = ccxt.gdax({'urls': {'api': 'https://example.com'}})
+    assert exchange.urls['api'] == 'https://example.com'
+    assert exchange.urls['www'] == ccxt.gdax().urls['www']
+
+
+if __name__ == '__main__':
+    test_settings_are_copied_per_instance()
+    test_markets_are_copied_per_instance()
+    test_config_api_is_compiled_per_instance()
+    test_config_overrides_settings()
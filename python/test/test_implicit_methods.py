@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from helpers import create_exchange  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_implicit_methods():
+    exchange = create_exchange(ccxt.gdax)
+    assert 'publicGetProducts' not in exchange.__dict__
+    # bound on first access, under both names
+    method = exchange.publicGetProducts
+    assert exchange.__dict__['publicGetProducts'] is method
+    assert exchange.publicGetProducts is method
+    assert exchange.public_get_products is not method
+    assert exchange.publicGetProducts() == {'url': 'https://api.gdax.com/products', 'number': 1}
+    assert exchange.public_get_products()['url'] == 'https://api.gdax.com/products'
+    assert exchange.publicGetProductsIdBook({'id': 'BTC-USD'})['url'] == 'https://api.gdax.com/products/BTC-USD/book'
+    # every instance binds its own
+    assert create_exchange(ccxt.gdax).publicGetProducts is not method
+
+
+def test_camelcase_aliases():
+    exchange = ccxt.gdax({'enableRateLimit': True})
+    assert exchange.loadMarkets == exchange.load_markets
+    assert exchange.__dict__['loadMarkets'] == exchange.load_markets
+    assert exchange.fetchTicker == exchange.fetch_ticker
+    assert exchange.enableRateLimit is True
+    # attributes are read every time, not cached
+    assert exchange.lastJsonResponse is None
+    exchange.last_json_response = {'id': 1}
+    assert exchange.lastJsonResponse == {'id': 1}
+    assert 'lastJsonResponse' not in exchange.__dict__
+    assert ccxt.gdax.camelcase_aliases() is ccxt.gdax.camelcase_aliases()
+    assert ccxt.gdax.camelcase_aliases()['fetchOrderBook'] == 'fetch_order_book'
+
+
+def test_unknown_names():
+    exchange = ccxt.gdax()
+    for name in ('publicGetUnknown', 'fetchUnknown', 'fetch_unknown', '_private', '__deepcopy__'):
+        try:
+            getattr(exchange, name)
+            assert False, 'resolved ' + name
+        except AttributeError as e:
+            assert name in str(e)
+    assert not hasattr(exchange, 'publicGetUnknown')
+    assert 'publicGetUnknown' not in exchange.__dict__
+
+
+if __name__ == '__main__':
+    test_implicit_methods()
+    test_camelcase_aliases()
+    test_unknown_names()
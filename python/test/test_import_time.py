@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Measures the time to import the library in a fresh interpreter
+# usage: python test/test_import_time.py [--async] [--runs N]
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--async', action='store_true', dest='use_async', help='benchmark ccxt.async instead of ccxt')
+parser.add_argument('--runs', type=int, default=5, help='number of fresh interpreters per scenario')
+argv = parser.parse_args()
+
+package = 'ccxt.async' if argv.use_async else 'ccxt'
+
+scenarios = [
+    ('import ' + package, 'import ' + package + ' as ccxt'),
+    ('one exchange', 'import ' + package + ' as ccxt; ccxt.binance'),
+    ('all exchanges', 'import ' + package + ' as ccxt; [getattr(ccxt, id) for id in ccxt.exchanges]'),
+]
+
+# ------------------------------------------------------------------------------
+
+
+def run(code):
+    start = time.time()
+    subprocess.check_call([sys.executable, '-c', code], cwd=root)
+    return time.time() - start
+
+
+# the interpreter startup alone, subtracted from every measurement
+baseline = min(run('pass') for i in range(argv.runs))
+
+for name, code in scenarios:
+    best = min(run(code) for i in range(argv.runs))
+    print('{0:<20} {1:8.1f} ms'.format(name, (best - baseline) * 1000))
+
+# ------------------------------------------------------------------------------
+# importing the package must not import any exchange module
+
+check = '; '.join([
+    'import sys',
+    'import ' + package + ' as ccxt',
+    'loaded = [id for id in ccxt.exchanges if "' + package + '." + id in sys.modules]',
+    'assert not loaded, loaded',
+    'assert ccxt.binance.__name__ == "binance"',
+    'assert getattr(ccxt, "kraken").__name__ == "kraken"',
+    'assert "' + package + '.kraken" in sys.modules and "' + package + '.bitfinex" not in sys.modules',
+])
+subprocess.check_call([sys.executable, '-c', check], cwd=root)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+from unittest import mock
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base import json_codec  # noqa: E402
+from ccxt.base.json_codec import JsonCodec, get_json_codec  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+data = {
+    'symbol': 'BTC/EUR',
+    'price': 0.1,
+    'amount': 12345.678901234567,
+    'info': [None, True, False, -1, 'café'],
+}
+
+
+class Ujson(object):
+    """Stands in for ujson, rejects the integers wider than 64 bits like it does"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def loads(self, data, **options):
+        self.calls += 1
+        result = json.loads(data)
+        if isinstance(result, int) and not (-2 ** 63 <= result < 2 ** 64):
+            raise OverflowError('Value is too big!')
+        return result
+
+
+def installed():
+    return [name for name in ('orjson', 'ujson') if getattr(json_codec, name)] + ['json']
+
+
+def test_round_trip():
+    for name in installed():
+        codec = JsonCodec(name)
+        assert codec.loads(codec.dumps(data)) == data, name
+        assert codec.loads(codec.dumps(data).encode('utf-8')) == data, name
+        assert codec.loads(str(2 ** 70)) == 2 ** 70, name
+        assert ' ' not in codec.dumps(data), name  # compact
+
+
+def test_shared():
+    assert get_json_codec('json') is get_json_codec('json')
+    assert get_json_codec().name == installed()[0]
+    try:
+        JsonCodec('simplejson')
+        assert False, 'accepted an unknown codec'
+    except ValueError:
+        pass
+
+
+def test_fallback():
+    ujson = Ujson()
+    with mock.patch.object(json_codec, 'orjson', None), mock.patch.object(json_codec, 'ujson', ujson):
+        codec = JsonCodec()
+        assert codec.name == 'ujson'
+        ujson.calls = 0
+        assert codec.loads('[1, 2]') == [1, 2]
+        # the input the faster library rejects is decoded by the standard library
+        assert codec.loads(str(2 ** 70)) == 2 ** 70
+        assert codec.loads(str(2 ** 70).encode('utf-8')) == 2 ** 70
+        assert ujson.calls == 3
+
+
+def test_missing():
+    with mock.patch.object(json_codec, 'orjson', None), mock.patch.object(json_codec, 'ujson', None):
+        assert JsonCodec().name == 'json'
+        for name in ('orjson', 'ujson'):
+            try:
+                JsonCodec(name)
+                assert False, name + ' is not installed'
+            except ImportError:
+                pass
+
+
+def test_exchange():
+    exchange = ccxt.Exchange({'jsonCodec': 'json'})
+    assert exchange.codec is get_json_codec('json')
+    assert exchange.unjson(exchange.json(data)) == data
+    assert ccxt.Exchange.unjson(ccxt.Exchange.json(data)) == data
+    try:
+        ccxt.Exchange({'jsonCodec': 'simplejson'})
+        assert False, 'accepted an unknown codec'
+    except ValueError:
+        pass
+
+
+if __name__ == '__main__':
+    test_round_trip()
+    test_shared()
+    test_fallback()
+    test_missing()
+    test_exchange()
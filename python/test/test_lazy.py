@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+from unittest import mock
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_assign():
+    binance = ccxt.binance
+    assert binance.__name__ == 'binance'
+    assert 'ccxt.binance' in sys.modules  # the submodule bound by the import system is not the class
+    ccxt.binance = 'assigned'
+    assert ccxt.binance == 'assigned'
+    del ccxt.binance
+    assert ccxt.binance is binance
+    try:
+        del ccxt.binance
+        assert False, 'deleted a name that was not assigned'
+    except AttributeError:
+        pass
+
+
+def test_patch():
+    kraken = ccxt.kraken
+    with mock.patch('ccxt.kraken') as patched:
+        assert ccxt.kraken is patched
+        ccxt.kraken({'apiKey': 'key'})
+        patched.assert_called_once_with({'apiKey': 'key'})
+    assert ccxt.kraken is kraken
+    with mock.patch.object(ccxt, 'gdax', 'patched'):
+        assert ccxt.gdax == 'patched'
+    assert ccxt.gdax.__name__ == 'gdax'
+
+
+def test_dir():
+    names = dir(ccxt)
+    assert 'binance' in names
+    assert 'exchanges' in names
+    assert set(ccxt.exchanges) <= set(names)
+    assert names == sorted(names)
+
+
+def test_unknown():
+    for name in ('unknown_exchange', 'Binance'):
+        try:
+            getattr(ccxt, name)
+            assert False, 'resolved ' + name
+        except AttributeError as e:
+            assert name in str(e)
+    assert not hasattr(ccxt, 'unknown_exchange')
+    assert 'unknown_exchange' not in dir(ccxt)
+
+
+if __name__ == '__main__':
+    test_assign()
+    test_patch()
+    test_dir()
+    test_unknown()
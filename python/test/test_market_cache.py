@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+from ccxt.base.market_cache import MarketCache  # noqa: E402
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+markets = [{'id': 'BTC-USD', 'symbol': 'BTC/USD', 'base': 'BTC', 'quote': 'USD'}]
+settings = {'api': 'https://api.gdax.com', 'options': {}}
+
+
+def test_hit_and_miss():
+    path = tempfile.mkdtemp()
+    cache = MarketCache('gdax', path, '1.0.0', settings)
+    assert cache.load() is None  # nothing saved yet
+    assert cache.save(markets)
+    entry = MarketCache('gdax', path, '1.0.0', settings).load()
+    assert entry['markets'] == markets
+    assert not MarketCache.is_expired(entry, 60000)
+    # another api url or other options have a cache of their own
+    sandbox = {'api': 'https://api-public.sandbox.gdax.com', 'options': {}}
+    assert MarketCache('gdax', path, '1.0.0', sandbox).load() is None
+    assert MarketCache('gdax', path, '1.0.0', {'api': settings['api'], 'options': {'type': 'future'}}).load() is None
+    assert MarketCache('kraken', path, '1.0.0', settings).load() is None
+    shutil.rmtree(path)
+
+
+def test_stale():
+    path = tempfile.mkdtemp()
+    cache = MarketCache('gdax', path, '1.0.0', settings)
+    cache.save(markets)
+    with open(cache.filename, 'r') as f:
+        entry = json.load(f)
+    entry['timestamp'] -= 120000
+    with open(cache.filename, 'w') as f:
+        json.dump(entry, f)
+    entry = cache.load()
+    assert entry['markets'] == markets  # still used, but refreshed
+    assert MarketCache.is_expired(entry, 60000)
+    shutil.rmtree(path)
+
+
+def test_version_mismatch():
+    path = tempfile.mkdtemp()
+    MarketCache('gdax', path, '1.0.0', settings).save(markets)
+    assert MarketCache('gdax', path, '1.0.1', settings).load() is None
+    cache = MarketCache('gdax', path, '1.0.0', settings)
+    with open(cache.filename, 'r') as f:
+        entry = json.load(f)
+    entry['version'] = MarketCache.version + 1
+    with open(cache.filename, 'w') as f:
+        json.dump(entry, f)
+    assert cache.load() is None
+    shutil.rmtree(path)
+
+
+def test_default_path():
+    home = tempfile.mkdtemp()
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    os.environ['XDG_CACHE_HOME'] = os.path.join(home, 'cache')
+    try:
+        cache = MarketCache('gdax', None, '1.0.0', settings)
+        assert cache.save(markets)
+        folder = os.path.join(home, 'cache', 'ccxt')
+        assert os.path.dirname(cache.filename) == folder
+        assert stat.S_IMODE(os.stat(folder).st_mode) & 0o077 == 0
+        assert stat.S_IMODE(os.stat(cache.filename).st_mode) & 0o077 == 0
+        if hasattr(os, 'geteuid') and (os.geteuid() == 0):
+            # a file of another user is not trusted
+            os.chown(cache.filename, 12345, 12345)
+            assert cache.load() is None
+    finally:
+        if cache_home is None:
+            del os.environ['XDG_CACHE_HOME']
+        else:
+            os.environ['XDG_CACHE_HOME'] = cache_home
+        shutil.rmtree(home)
+
+
+def test_load_markets():
+    path = tempfile.mkdtemp()
+    calls = []
+
+    def fetch_markets():
+        calls.append(time.time())
+        return markets
+
+    config = {'marketsCache': {'enabled': True, 'path': path}}
+    exchange = ccxt.gdax(config)
+    exchange.fetch_markets = fetch_markets
+    exchange.load_markets()
+    exchange = ccxt.gdax(config)
+    exchange.fetch_markets = fetch_markets
+    assert 'BTC/USD' in exchange.load_markets()
+    assert len(calls) == 1  # the second instance reads the cache
+    shutil.rmtree(path)
+
+
+def test_expired_markets_are_refreshed():
+    path = tempfile.mkdtemp()
+    threads = []
+    fresh = markets + [{'id': 'ETH-USD', 'symbol': 'ETH/USD', 'base': 'ETH', 'quote': 'USD'}]
+
+    def fetch_markets():
+        threads.append(threading.current_thread())
+        return fresh
+
+    def fetch_markets_failing():
+        raise ExchangeNotAvailable('gdax is down')
+
+    config = {'marketsCache': {'enabled': True, 'path': path, 'maxAge': 60000}}
+    exchange = ccxt.gdax(config)
+    exchange.get_markets_cache().save(markets)
+    cache = exchange.get_markets_cache()
+    with open(cache.filename, 'r') as f:
+        entry = json.load(f)
+    entry['timestamp'] -= 120000
+    with open(cache.filename, 'w') as f:
+        json.dump(entry, f)
+    # the expired markets are used when they cannot be refreshed
+    exchange.fetch_markets = fetch_markets_failing
+    assert list(exchange.load_markets()) == ['BTC/USD']
+    # otherwise they are refreshed before returning, on the calling thread
+    exchange = ccxt.gdax(config)
+    exchange.fetch_markets = fetch_markets
+    assert sorted(exchange.load_markets()) == ['BTC/USD', 'ETH/USD']
+    assert threads == [threading.current_thread()]
+    entry = cache.load()
+    assert not MarketCache.is_expired(entry, 60000)
+    assert [market['symbol'] for market in entry['markets']] == ['BTC/USD', 'ETH/USD']
+    shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    test_hit_and_miss()
+    test_stale()
+    test_version_mismatch()
+    test_default_path()
+    test_load_markets()
+    test_expired_markets_are_refreshed()
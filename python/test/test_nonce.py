@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.nonce import FileNonce  # noqa: E402
+from ccxt.base.nonce import MonotonicNonce  # noqa: E402
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_monotonic_nonce():
+    source = MonotonicNonce()
+    assert [source.next(5), source.next(5), source.next(3), source.next(10)] == [5, 6, 7, 10]
+    nonces = []
+
+    def run():
+        for i in range(1000):
+            nonces.append(source.next(100))
+
+    threads = [threading.Thread(target=run) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(nonces) == list(range(100, 4100))
+
+
+def run_file_nonce(filename, queue):
+    source = FileNonce(filename)
+    queue.put([source.next(1) for i in range(500)])
+    source.close()
+
+
+def test_file_nonce():
+    fd, filename = tempfile.mkstemp()
+    os.close(fd)
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_file_nonce, args=(filename, queue)) for i in range(3)]
+    for process in processes:
+        process.start()
+    nonces = sum([queue.get(timeout=10) for process in processes], [])
+    for process in processes:
+        process.join()
+    # the processes never hand out the same nonce
+    assert sorted(nonces) == list(range(1, 1501))
+    os.remove(filename)
+
+
+def run_inherited_file_nonce(source, queue):
+    queue.put([source.next(1) for i in range(2000)])
+
+
+def test_file_nonce_before_fork():
+    fd, filename = tempfile.mkstemp()
+    os.close(fd)
+    source = FileNonce(filename)  # inherited by the forked processes
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_inherited_file_nonce, args=(source, queue)) for i in range(4)]
+    for process in processes:
+        process.start()
+    nonces = sum([queue.get(timeout=30) for process in processes], [])
+    nonces.extend(source.next(1) for i in range(100))
+    for process in processes:
+        process.join()
+    assert len(set(nonces)) == len(nonces) == 8100
+    source.close()
+    os.remove(filename)
+
+
+def test_config_nonce():
+    exchange = ccxt.kraken({'apiKey': 'config-nonce', 'nonce': lambda: 42, 'monotonicNonce': True})
+    assert exchange.nonce() == 42
+    assert exchange.nonce() == 43  # still strictly increasing
+    # opt-in, the nonces of seconds checked against the server time are left as they are
+    exchange = ccxt.kraken({'nonce': lambda: 7})
+    assert [exchange.nonce(), exchange.nonce()] == [7, 7]
+    assert ccxt.bitz().nonce() < 1000000  # wraps around every 1000 seconds
+
+
+if __name__ == '__main__':
+    test_monotonic_nonce()
+    test_file_nonce_before_fork()
+    test_config_nonce()
+    test_file_nonce()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.async.ws.base.order_book import OrderBook  # noqa: E402
+from ccxt.async.ws.base.order_book import RawOrderBook  # noqa: E402
+from ccxt.async.ws.bitfinex import bitfinex  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def test_order_book():
+    book = OrderBook()
+    book.reset([[99.0, 1.0], [100.0, 2.0], [98.0, 3.0]], [[102.0, 1.0], [101.0, 2.0]], 1, 'time')
+    assert book.best_bid() == [100.0, 2.0]
+    assert book.best_ask() == [101.0, 2.0]
+    book.bids.update(100.5, 4.0)
+    book.asks.update(101.0, 0)  # deletes the level
+    book.bids.delete(98.0)
+    book.bids.delete(97.0)  # missing levels are ignored
+    assert book.snapshot(2) == {
+        'bids': [[100.5, 4.0], [100.0, 2.0]],
+        'asks': [[102.0, 1.0]],
+        'timestamp': 1,
+        'datetime': 'time',
+    }
+
+
+def test_order_book_random():
+    book = OrderBook()
+    expected = {}
+    for i in range(5000):
+        price = float(random.randint(1, 200))
+        amount = random.choice([0, 0, random.random()])
+        book.asks.update(price, amount)
+        if amount:
+            expected[price] = amount
+        else:
+            expected.pop(price, None)
+    assert book.asks.top() == [[price, expected[price]] for price in sorted(expected)]
+    assert book.asks.top(5) == book.asks.top()[:5]
+
+
+def test_bitfinex_order_book_builder():
+    exchange = bitfinex.__new__(bitfinex)  # without connecting
+    exchange.orderbooks = {'BTC/USD': OrderBook()}
+    # [channel, [[price, count, amount], ...]]
+    exchange.order_book_builder([5, [[100, 2, 1.5], [99, 1, 3], [101, 1, -2], [102, 4, -0.5]]], 1, 'a', 'BTC/USD')
+    # [channel, [price, count, amount]]
+    exchange.order_book_builder([5, [100.5, 1, 0.25]], 2, 'b', 'BTC/USD')
+    exchange.order_book_builder([5, [101, 0, -1]], 3, 'c', 'BTC/USD')
+    exchange.order_book_builder([5, [99, 0, 1]], 4, 'd', 'BTC/USD')
+    assert exchange.order_book_fetch('BTC/USD') == {
+        'bids': [[100.5, 0.25], [100, 1.5]],
+        'asks': [[102, 0.5]],
+        'timestamp': 4,
+        'datetime': 'd',
+    }
+
+
+def test_raw_order_book():
+    book = RawOrderBook()
+    book.reset([[1, 'bids', 100.0, 2.0], [2, 'bids', 100.0, 1.0], [3, 'asks', 101.0, 1.0]], 1, 'a')
+    book.update(4, 'bids', 100.0, 0.5)
+    book.update(1, 'bids', 100.0, 1.5)  # keeps its place in the queue
+    book.update(2, 'bids', 99.0, 1.0)   # moves to the back of another level
+    book.delete(3)
+    assert book.queue_position(4) == 1.5
+    assert book.snapshot() == {'bids': [[100.0, 2.0], [99.0, 1.0]], 'asks': [], 'timestamp': 1, 'datetime': 'a'}
+    assert book.raw_snapshot(1)['bids'] == [[100.0, 1.5, 1], [100.0, 0.5, 4]]
+
+
+test_order_book()
+test_order_book_random()
+test_bitfinex_order_book_builder()
+test_raw_order_book()
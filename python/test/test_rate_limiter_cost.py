@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class Weighted(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Weighted, self).describe(), {
+            'id': 'weighted',
+            'rateLimit': 20,
+            'api': {
+                'public': {
+                    'get': {
+                        'time': 1,
+                        'ticker/24hr': {'cost': 1, 'noSymbol': 10},
+                        'depth': {'cost': 1, 'byLimit': [[100, 1], [500, 5], [1000, 10]]},
+                    },
+                    'post': [
+                        'order',
+                    ],
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': path, 'method': method, 'headers': headers, 'body': body}
+
+
+def test_define_rest_api():
+    exchange = Weighted()
+    endpoints = exchange.endpoints
+    assert endpoints[('public', 'GET', 'ticker/24hr')] == {
+        'camelcase': 'publicGetTicker24hr',
+        'underscore': 'public_get_ticker_24hr',
+        'cost': {'cost': 1, 'noSymbol': 10},
+    }
+    assert endpoints[('public', 'GET', 'time')]['cost'] == 1
+    # the paths of a list have no cost
+    assert endpoints[('public', 'POST', 'order')]['cost'] is None
+    for name in ('publicGetTicker24hr', 'public_get_ticker_24hr', 'publicGetDepth', 'publicPostOrder'):
+        assert callable(getattr(exchange, name)), name
+
+
+def test_calculate_rate_limiter_cost():
+    exchange = Weighted()
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'time', {}) == 1
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'ticker/24hr', {'symbol': 'BTCUSDT'}) == 1
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'ticker/24hr', {}) == 10
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {}) == 1
+    costs = [exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {'limit': limit}) for limit in (5, 100, 101, 500, '1000')]
+    assert costs == [1, 1, 5, 5, 10], costs
+    assert exchange.calculate_rate_limiter_cost('public', 'POST', 'order', {}) is None
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'unknown', {}) is None
+
+
+def test_binance_weights():
+    exchange = ccxt.binance()
+    # the rateLimit is the interval of one unit of request weight, 1200 per minute
+    assert exchange.rateLimit == 50
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'ticker/24hr', {}) == 40
+    assert exchange.calculate_rate_limiter_cost('private', 'GET', 'openOrders', {'symbol': 'BTCUSDT'}) == 1
+    assert exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {'limit': 500}) == 5
+
+
+def test_throttle_cost():
+    exchange = Weighted({'enableRateLimit': True})
+    exchange.fetch = lambda url, method='GET', headers=None, body=None: {}
+    start = time.time()
+    exchange.publicGetTicker24hr()
+    # the cost is paid after the request, the first one goes right away
+    assert time.time() - start < 0.1
+    exchange.publicGetTime()
+    # the next one waits for the 10 units of the previous one
+    assert time.time() - start >= 0.19
+    middle = time.time()
+    exchange.publicGetTime()
+    assert 0.015 <= time.time() - middle < 0.1
+
+
+if __name__ == '__main__':
+    test_define_rest_api()
+    test_calculate_rate_limiter_cost()
+    test_binance_weights()
+    test_throttle_cost()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.response_cache import ResponseCache  # noqa: E402
+from helpers import create_exchange  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+class Cached(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Cached, self).describe(), {
+            'id': 'cached',
+            'api': {
+                'public': {'get': ['ticker', 'time']},
+                'private': {'get': ['balance']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        url = '/' + api + '/' + path + '?' + self.urlencode(self.keysort(params))
+        return {'url': url, 'method': method, 'headers': headers, 'body': body}
+
+
+def test_expiry():
+    cache = ResponseCache(10)
+    cache.set('a', 1, 50)
+    cache.set('b', 2, 1000)
+    assert (cache.get('a'), cache.get('b')) == (1, 2)
+    time.sleep(0.1)
+    assert cache.get('a') is None  # expired
+    assert cache.get('b') == 2
+    assert cache.get('c', 'default') == 'default'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (3, 2, 0, 1), stats
+
+
+def test_eviction():
+    cache = ResponseCache(3)
+    for key in 'abc':
+        cache.set(key, key, 1000)
+    cache.get('a')  # a is the most recently used now
+    cache.set('d', 'd', 1000)
+    assert cache.get('b') is None  # the least recently used one is evicted
+    assert [cache.get(key) for key in 'acd'] == ['a', 'c', 'd']
+    cache.set('a', 'A', 1000)  # replacing an entry evicts nothing
+    stats = cache.stats()
+    assert (stats['evictions'], stats['size'], stats['maxSize']) == (1, 3, 3), stats
+
+
+def test_exchange_cache():
+    exchange = create_exchange(Cached, {'cacheTTL': {'publicGetTicker': 50}})
+    first = exchange.publicGetTicker({'symbol': 'BTCUSD'})
+    first['number'] = 'changed'  # the callers get copies of the cached response
+    assert exchange.publicGetTicker({'symbol': 'BTCUSD'}) == {'url': '/public/ticker?symbol=BTCUSD', 'number': 1}
+    assert len(exchange.requests) == 1
+    exchange.publicGetTicker({'symbol': 'ETHUSD'})
+    assert len(exchange.requests) == 2
+    # the endpoints without a ttl are not cached
+    exchange.publicGetTime()
+    exchange.publicGetTime()
+    exchange.privateGetBalance()
+    exchange.privateGetBalance()
+    assert len(exchange.requests) == 6
+    time.sleep(0.1)
+    assert exchange.publicGetTicker({'symbol': 'BTCUSD'})['number'] == 7
+    stats = exchange.responseCache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 3), stats
+
+
+def test_exchange_cache_size():
+    exchange = create_exchange(Cached, {'cacheTTL': {'public_get_ticker': 1000}, 'cacheMaxSize': 2})
+    for symbol in ('A', 'B', 'C', 'A'):
+        exchange.public_get_ticker({'symbol': symbol})
+    # A was evicted by C, so it is fetched again
+    assert len(exchange.requests) == 4
+    assert exchange.responseCache.stats()['evictions'] == 2
+
+
+if __name__ == '__main__':
+    test_expiry()
+    test_eviction()
+    test_exchange_cache()
+    test_exchange_cache_size()
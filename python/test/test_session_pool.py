@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async as ccxt  # noqa: E402
+from ccxt.async.base.session_pool import SessionPool  # noqa: E402
+from ccxt.async.base.session_pool import default_session_pool  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+async def test_shared_session():
+    pool = SessionPool({'limitPerHost': 5})
+    first = ccxt.gdax({'session_pool': pool})
+    second = ccxt.kraken({'session_pool': pool})
+    # one session, connector and DNS cache for all the exchanges of an event loop
+    assert first.session is second.session
+    assert first.session.connector is second.session.connector
+    session = first.session
+    await first.close()
+    assert first.session is None
+    assert not session.closed  # still used by the second exchange
+    await second.close()
+    assert session.closed
+    assert pool.sessions == {}
+    # a new exchange after all of them are closed gets a new session
+    third = ccxt.gdax({'session_pool': pool})
+    assert (third.session is not session) and not third.session.closed
+    await pool.close()
+    assert third.session.closed
+
+
+async def test_own_session():
+    pool = SessionPool()
+    pooled = ccxt.gdax({'session_pool': pool})
+    session = pool.create_session(asyncio.get_event_loop())
+    own = ccxt.gdax({'session_pool': pool, 'session': session})
+    assert own.session is session
+    await own.close()
+    assert not session.closed  # left to its owner
+    assert not pooled.session.closed
+    await pooled.close()
+    await session.close()
+
+
+async def test_sessions_per_instance():
+    first = ccxt.gdax()
+    second = ccxt.gdax()
+    # without a pool every exchange has a session of its own
+    assert first.session_pool is None
+    assert first.session is not second.session
+    await first.session.close()
+    assert not second.session.closed
+    session = second.session
+    await second.close()
+    assert session.closed and (second.session is None)
+    # the process-wide pool is shared when it is passed explicitly
+    pool = default_session_pool()
+    third = ccxt.gdax({'session_pool': pool})
+    fourth = ccxt.kraken({'session_pool': pool})
+    assert third.session is fourth.session
+    await third.close()
+    await fourth.close()
+
+
+def test_connection_limits():
+    # no cap per host, only the total is limited
+    connector = SessionPool().create_session(asyncio.get_event_loop()).connector
+    assert connector.limit_per_host == 0
+    assert connector.limit == 100
+    connector = SessionPool({'limitPerHost': 5}).create_session(asyncio.get_event_loop()).connector
+    assert connector.limit_per_host == 5
+
+
+async def main():
+    await test_shared_session()
+    await test_own_session()
+    await test_sessions_per_instance()
+    test_connection_limits()
+    print('session pool tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
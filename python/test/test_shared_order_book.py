@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported  # noqa: E402
+from ccxt.base.shared_order_book import SharedOrderBookReader  # noqa: E402
+from ccxt.base.shared_order_book import SharedOrderBookWriter  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def read(name, queue):
+    reader = SharedOrderBookReader(name)
+    queue.put((reader.symbols(), reader.snapshot('BTC/USD', 1), reader.snapshot('XRP/USD')))
+    reader.close()
+
+
+def test_shared_order_book():
+    name = 'test-' + str(os.getpid())
+    writer = SharedOrderBookWriter(name, slots=2, depth=3)
+    writer.write('ETH/USD', [[850.1, 10.0]], [], 1000)
+    writer.write('BTC/USD', [[100.0, 1.0], [99.0, 2.0], [98.0, 3.0], [97.0, 4.0]], [[101.0, 0.5]], 1500000000123)
+    reader = SharedOrderBookReader(name)
+    version = reader.version('BTC/USD')
+    assert reader.snapshot('BTC/USD') == {
+        'bids': [[100.0, 1.0], [99.0, 2.0], [98.0, 3.0]],  # at most depth levels are shared
+        'asks': [[101.0, 0.5]],
+        'timestamp': 1500000000123,
+        'datetime': '2017-07-14T02:40:00.123Z',
+    }
+    writer.write('BTC/USD', [], [[101.0, 0.25]])
+    assert reader.version('BTC/USD') == version + 2
+    assert reader.snapshot('BTC/USD')['asks'] == [[101.0, 0.25]]
+    try:
+        writer.write('LTC/USD', [], [])
+        assert False
+    except NotSupported:
+        pass
+
+    # from another process
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=read, args=(name, queue))
+    process.start()
+    symbols, snapshot, missing = queue.get(timeout=10)
+    process.join()
+    assert symbols == ['ETH/USD', 'BTC/USD']
+    assert snapshot['bids'] == [] and snapshot['asks'] == [[101.0, 0.25]] and snapshot['timestamp'] is None
+    assert missing is None
+
+    reader.close()
+    writer.close()
+
+
+if __name__ == '__main__':
+    test_shared_order_book()
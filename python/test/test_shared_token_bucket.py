@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.base.shared_token_bucket import SharedTokenBucket  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+rate_limit = 20  # milliseconds
+
+
+def run(filename, queue):
+    bucket = SharedTokenBucket(filename)
+    timestamps = []
+    for i in range(5):
+        time.sleep(bucket.acquire(1, rate_limit) / 1000.0)
+        timestamps.append(time.time() * 1000)
+    bucket.close()
+    queue.put(timestamps)
+
+
+def test_shared_token_bucket():
+    fd, filename = tempfile.mkstemp()
+    os.close(fd)
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run, args=(filename, queue)) for i in range(4)]
+    for process in processes:
+        process.start()
+    timestamps = sorted(sum([queue.get(timeout=10) for process in processes], []))
+    for process in processes:
+        process.join()
+    # the processes share one rateLimit instead of having one each
+    gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
+    assert min(gaps) >= rate_limit - 5, gaps
+    bucket = SharedTokenBucket(filename)
+    assert bucket.stats()['requests'] == 20
+    # a pause holds back the next request of every process
+    bucket.pause(200)
+    assert bucket.acquire(1, rate_limit) >= 200 - 5
+    bucket.close()
+    os.remove(filename)
+
+
+def run_inherited(bucket, queue):
+    queue.put([bucket.acquire(1, 1) for i in range(2000)])
+
+
+def test_shared_token_bucket_before_fork():
+    fd, filename = tempfile.mkstemp()
+    os.close(fd)
+    bucket = SharedTokenBucket(filename)  # inherited by the forked processes
+    start = bucket.milliseconds()
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_inherited, args=(bucket, queue)) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        queue.get(timeout=30)
+    for process in processes:
+        process.join()
+    # every reservation has been counted and has moved the bucket by its cost
+    assert bucket.stats()['requests'] == 8000
+    full = bucket.state.unpack_from(bucket.mmap, 0)[1]
+    assert full >= start + 8000 - 1, full - start
+    bucket.close()
+    os.remove(filename)
+
+
+if __name__ == '__main__':
+    test_shared_token_bucket()
+    test_shared_token_bucket_before_fork()
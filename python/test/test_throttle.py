@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+from ccxt.async.base.throttle import throttle  # noqa: E402
+from ccxt.async.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import DDoSProtection  # noqa: E402
+from ccxt.base.errors import RequestTimeout  # noqa: E402
+from ccxt.base.rate_limit_budget import RateLimitBudget  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+rate_limit = 50  # milliseconds
+
+
+async def test_throttle_fifo():
+    loop = asyncio.get_event_loop()
+    bucket = throttle({
+        'refillRate': 1.0 / rate_limit,
+        'capacity': 1.0,
+        'defaultCost': 1.0,
+    })
+    released = []
+    costs = [None, None, None, None, None, 3, None]
+    start = loop.time()
+    futures = [bucket(cost) for cost in costs]
+    for i, future in enumerate(futures):
+        future.add_done_callback(lambda future, i=i: released.append((i, loop.time())))
+    await asyncio.wait(futures)
+
+    # waiters are released strictly in the order they were queued
+    assert [i for i, _ in released] == list(range(7))
+
+    # the first token is free, every next one costs one rateLimit interval
+    # the heavy call at index 5 delays the one after it by three intervals
+    elapsed = [(timestamp - start) * 1000 for _, timestamp in released]
+    expected = [0, 1, 2, 3, 4, 5, 8]
+    for actual, intervals in zip(elapsed, expected):
+        assert actual >= intervals * rate_limit - 5, elapsed
+        assert actual < intervals * rate_limit + 40, elapsed
+
+
+async def test_throttle_cancelled_waiter():
+    bucket = throttle({'refillRate': 1.0 / rate_limit})
+    await bucket()
+    cancelled = bucket()
+    cancelled.cancel()
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    await bucket()
+    # the cancelled waiter does not consume a token
+    assert (loop.time() - start) * 1000 < 2 * rate_limit
+
+
+async def test_adaptive_rate_limit():
+    exchange = Exchange({
+        'id': 'test',
+        'rateLimit': rate_limit,
+        'enableRateLimit': True,
+        'adaptiveRateLimit': {'enabled': True, 'successes': 2, 'increase': 0.25},
+        'retryPolicy': {'maxRetries': 0},
+    })
+    responses = [{}, DDoSProtection('429'), {}, {}, {}, {}]
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        response = responses.pop(0)
+        exchange.last_response_headers = {'Retry-After': '0.2'} if isinstance(response, Exception) else {}
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    exchange.fetch = fetch
+    exchange.sign = lambda path, api, method, params, headers, body: {'url': path, 'method': method, 'headers': headers, 'body': body}
+    await exchange.fetch2('a')
+    try:
+        await exchange.fetch2('b')
+        assert False
+    except DDoSProtection:
+        pass
+    assert exchange.effective_rate_limit() == 2 * rate_limit
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    await exchange.fetch2('c')
+    # the Retry-After pause comes before the next token
+    assert (loop.time() - start) * 1000 >= 200 - 5
+    await exchange.fetch2('d')
+    assert exchange.effective_rate_limit() == rate_limit / 0.75
+    await exchange.fetch2('e')
+    await exchange.fetch2('f')
+    assert exchange.effective_rate_limit() == rate_limit
+    await exchange.close()
+
+
+async def test_throttle_budget():
+    loop = asyncio.get_event_loop()
+    budget = RateLimitBudget({'remaining': 'X-RateLimit-Remaining', 'limit': 10, 'reset': 'X-RateLimit-Reset'})
+    bucket = throttle({'refillRate': 1.0 / rate_limit, 'budget': budget})
+    # the pace of the rateLimit until the exchange tells the budget
+    assert budget.delay(1) is None
+    budget.update({'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '0.3'})
+    start = loop.time()
+    for i in range(5):
+        await bucket()
+    # four requests in a burst, the last one of the budget is kept in reserve
+    assert (loop.time() - start) * 1000 < rate_limit
+    assert budget.remaining == 0
+    # the budget is exhausted, the next request waits for the next window
+    await bucket()
+    assert (loop.time() - start) * 1000 >= 300 - 5
+
+
+async def test_budget_in_flight():
+    exchange = Exchange({
+        'id': 'test',
+        'rateLimit': rate_limit,
+        'enableRateLimit': True,
+        'rateLimitHeaders': {'remaining': 'X-RateLimit-Remaining', 'limit': 10, 'interval': 60000},
+    })
+    budget = exchange.rate_limit_budget
+    answered = []
+    estimates = []
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        exchange.last_response_headers = None
+        await asyncio.sleep(0.2)
+        if url == 'timeout':
+            raise RequestTimeout(url)
+        # the exchange counts a request when it answers it, the others are still on the way
+        answered.append(url)
+        exchange.last_response_headers = {'X-RateLimit-Remaining': str(10 - len(answered))}
+        return {}
+
+    update = budget.update
+
+    def record(headers, now=None):
+        result = update(headers, now)
+        estimates.append(budget.remaining)
+        return result
+
+    budget.update = record
+    exchange.fetch = fetch
+    exchange.sign = lambda path, api, method, params, headers, body: {'url': path, 'method': method, 'headers': headers, 'body': body}
+    # three overlapping requests, each response reports the budget before the other two are counted
+    await asyncio.gather(exchange.fetch2('a'), exchange.fetch2('b'), exchange.fetch2('c'))
+    assert estimates == [7, 7, 7], estimates
+    assert budget.in_flight == 0
+    # a failed request is released too, its cost stays spent
+    try:
+        await exchange.fetch2('timeout', 'private')
+        assert False
+    except RequestTimeout:
+        pass
+    assert budget.in_flight == 0
+    assert budget.remaining == 6
+    await exchange.close()
+
+
+async def test_retries():
+    exchange = Exchange({
+        'id': 'test',
+        'rateLimit': rate_limit,
+        'enableRateLimit': True,
+        'retryPolicy': {'baseDelay': 10, 'maxDelay': 20},
+    })
+    attempts = []
+
+    async def fetch(url, method='GET', headers=None, body=None):
+        attempts.append(url)
+        if len(attempts) < 3:
+            raise RequestTimeout(url)
+        return {}
+
+    exchange.fetch = fetch
+    exchange.sign = lambda path, api, method, params, headers, body: {'url': path + str(len(attempts)), 'method': method, 'headers': headers, 'body': body}
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    await exchange.fetch2('a')
+    # signed again for every attempt, each one of them waits for a token
+    assert attempts == ['a0', 'a1', 'a2']
+    assert (loop.time() - start) * 1000 >= 2 * rate_limit - 5
+    # private requests are not retried by default
+    del attempts[:]
+    try:
+        await exchange.fetch2('b', 'private')
+        assert False
+    except RequestTimeout:
+        pass
+    assert len(attempts) == 1
+    stats = exchange.retry_stats
+    assert (stats['requests'], stats['retries'], stats['recovered'], stats['failed']) == (1, 2, 1, 0), stats
+    await exchange.close()
+
+
+async def main():
+    await test_throttle_fifo()
+    await test_throttle_cancelled_waiter()
+    await test_adaptive_rate_limit()
+    await test_throttle_budget()
+    await test_budget_in_flight()
+    await test_retries()
+    print('throttle tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
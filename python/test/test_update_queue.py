@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async.ws as ccxt  # noqa: E402
+from ccxt.async.ws.base.update_queue import UpdateQueue  # noqa: E402
+from ws_helpers import Server  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def send_snapshots(connection, packet):
+    if packet['type'] == 'subscribe':
+        for product_id in packet['product_ids']:
+            connection.push({'type': 'snapshot', 'product_id': product_id, 'bids': [['100', '1']], 'asks': [['200', '1']]})
+
+
+def l2update(product_id, price):
+    return {'type': 'l2update', 'product_id': product_id, 'changes': [['buy', str(price), '1']]}
+
+
+async def create_exchange(config=None):
+    exchange = ccxt.gdax(dict({'aiohttp_session': Server(send_snapshots)}, **(config or {})))
+    while not exchange.connection['connected']:
+        await asyncio.sleep(0)
+    return exchange, exchange.aiohttp_session.connections[0]
+
+
+async def test_block():
+    queue = UpdateQueue('block', 2)
+    await queue.put(1)
+    await queue.put(2)
+    try:
+        await asyncio.wait_for(queue.put(3), 0.01)
+        assert False, 'put into a full queue'
+    except asyncio.TimeoutError:
+        pass
+    assert await queue.get() == 1
+    await queue.put(3)
+    assert [await queue.get(), await queue.get()] == [2, 3]
+    assert queue.updates == 1
+    stats = queue.stats()
+    assert (stats['received'], stats['dropped'], stats['size']) == (4, 0, 0), stats
+
+
+async def test_drop_oldest():
+    queue = UpdateQueue('dropOldest', 2)
+    for item in (1, 2, 3):
+        await queue.put(item)
+    assert [await queue.get(), await queue.get()] == [2, 3]
+    stats = queue.stats()
+    assert (stats['received'], stats['dropped']) == (3, 1), stats
+
+
+async def test_conflate():
+    queue = UpdateQueue('conflate')
+    for item in (1, 2, 3):
+        await queue.put(item)
+    assert await queue.get() == 3
+    assert queue.updates == 3  # the latest item stands for three updates
+    await queue.put(4)
+    assert await queue.get() == 4
+    assert queue.updates == 1
+    assert queue.stats()['conflated'] == 2
+    try:
+        UpdateQueue('latest')
+        assert False, 'accepted an unknown policy'
+    except ValueError:
+        pass
+
+
+async def test_stream():
+    exchange, connection = await create_exchange()
+    stream = exchange.stream('orderbooks', 'BTC/USD')
+    book = await stream.__anext__()
+    assert book['bids'] == [[100.0, 1.0]]
+    connection.push(l2update('BTC-USD', 101))
+    book = await stream.__anext__()
+    assert book['bids'][0] == [101.0, 1.0]
+    # the conflating iterator gets the latest book with the number of updates behind it
+    conflated = exchange.stream('orderbooks', 'BTC/USD', 'conflate')
+    connection.push(l2update('BTC-USD', 102))
+    await conflated.__anext__()
+    for price in (103, 104, 105):
+        connection.push(l2update('BTC-USD', price))
+    await asyncio.sleep(0.01)
+    book = await conflated.__anext__()
+    assert book['bids'][0] == [105.0, 1.0]
+    assert book['updates'] == 3
+    subscription = exchange.subscriptions[('orderbooks', 'BTC/USD')]
+    assert len(subscription['consumers']) == 2
+    stream.close()
+    conflated.close()
+    assert subscription['consumers'] == []
+    await exchange.close()
+
+
+async def test_slow_consumer():
+    exchange, connection = await create_exchange({'updateQueueSize': 5})
+    # a blocking iterator that is not read any more holds back its own subscription only
+    stream = exchange.stream('orderbooks', 'BTC/USD', 'block', 1)
+    await stream.__anext__()
+    await asyncio.wait_for(await exchange.subscribe_order_book('ETH/USD'), 1)
+    for price in range(101, 121):
+        connection.push(l2update('BTC-USD', price))
+    connection.push(l2update('ETH-USD', 150))
+    await asyncio.sleep(0.05)
+    assert exchange.order_book_fetch('ETH/USD')['bids'][0] == [150.0, 1.0]
+    # the book that fell behind is resynced instead of missing updates
+    metrics = exchange.queue_metrics()['subscriptions']
+    assert metrics[('orderbooks', 'BTC/USD')]['updatesDropped'] > 0
+    assert metrics[('orderbooks', 'ETH/USD')]['updatesDropped'] == 0
+    assert exchange.validation_stats['resyncs'] > 0
+    assert exchange.queue_metrics()['responses'] == 0  # the reader was never held back
+    await exchange.close()
+
+
+async def main():
+    await test_block()
+    await test_drop_oldest()
+    await test_conflate()
+    await test_stream()
+    await test_slow_consumer()
+    print('update queue tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -50,11 +50,12 @@ async def main():
     symbols_to_load = ['XRP/USD', 'BTC/USD', 'ETH/BTC', 'ETH/USD', 'LTC/BTC', 'LTC/USD']
     input_coroutines = [exchange.subscribe_order_book(symbol, status_queue=status_queue) for symbol in symbols_to_load]
     results = await asyncio.gather(*input_coroutines, return_exceptions=True)
-    for result, symbol in zip(results, symbols_to_load):
-        if isinstance(result, dict):
-            print('ERROR loading Symbol: {0}, {1}'.format(symbol, result))
 
-    await asyncio.sleep(3)
+    # wait for the first update of every book
+    done, pending = await asyncio.wait(results, timeout=exchange.subscribeTimeout / 1000)
+    for result, symbol in zip(results, symbols_to_load):
+        if result in pending:
+            print('ERROR loading Symbol: {0}, timed out'.format(symbol))
 
     for symbol in symbols_to_load:
         order_book = await exchange.fetchOrderBook(symbol)
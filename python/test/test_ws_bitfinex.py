@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Replays recorded Bitfinex v2 frames through the event handler, without connecting
+
+import asyncio
+import os
+import sys
+import zlib
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async.ws as ccxt  # noqa: E402
+from ws_helpers import Connection, Server, text_message  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+subscribed = {'event': 'subscribed', 'channel': 'book', 'chanId': 17, 'symbol': 'tBTCUSD', 'prec': 'P0', 'freq': 'F0', 'len': '100', 'pair': 'BTCUSD'}
+snapshot = [17, [[100, 2, 1.5], [99, 1, 3], [101, 1, -2], [102, 4, -0.5]]]
+update = [17, [100.5, 1, 0.25]]
+# the book after the update, bids and asks interleaved from the top, the asks negative
+checksum = zlib.crc32(b'100.5:0.25:101:-2:100:1.5:102:-0.5:99:3')
+checksum = checksum - 0x100000000 if checksum >= 0x80000000 else checksum
+
+# ------------------------------------------------------------------------------
+
+
+class Rest(object):
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    async def fetch_order_book(self, symbol):
+        return self.snapshot
+
+
+def create_exchange(validation):
+    exchange = ccxt.bitfinex({'orderBookValidation': validation})
+    exchange.websocket_task.cancel()  # the frames are replayed by the test
+    exchange.ws = Connection(Server())
+    return exchange
+
+
+async def replay(exchange, *frames):
+    for frame in frames:
+        await exchange.event_handler(text_message(frame))
+    await asyncio.sleep(0.01)  # let the builders apply the updates
+
+
+def sent(exchange):
+    packets = []
+    while not exchange.queue_request.empty():
+        packets.append(exchange.queue_request.get_nowait())
+    return packets
+
+
+async def test_checksum():
+    exchange = create_exchange({'checksum': True})
+    assert exchange.connection_request_packets() == [{'event': 'conf', 'flags': 131072}]
+    ready = await exchange.subscribe_order_book('BTC/USD')
+    request = {'event': 'subscribe', 'channel': 'book', 'symbol': 'tBTCUSD', 'prec': 'P0', 'freq': 'F0', 'len': '100'}
+    assert sent(exchange) == [request]
+    await replay(exchange, subscribed, snapshot, update, [17, 'cs', checksum])
+    assert ready.done()
+    assert exchange.order_book_fetch('BTC/USD', 1) == {'bids': [[100.5, 0.25]], 'asks': [[101, 2]], 'timestamp': exchange.orderbooks['BTC/USD'].timestamp, 'datetime': exchange.orderbooks['BTC/USD'].datetime}
+    assert exchange.validation_stats['checksums'] == 1
+    assert exchange.validation_stats['resyncs'] == 0
+    # a mismatch clears the book and renews the subscription
+    await replay(exchange, [17, 'cs', checksum + 1])
+    assert exchange.validation_stats['checksumMismatches'] == 1
+    assert exchange.validation_stats['resyncs'] == 1
+    assert sent(exchange) == [{'event': 'unsubscribe', 'chanId': 17}, request]
+    assert not exchange.subscriptions[('orderbooks', 'BTC/USD')]['ready'].done()
+    assert exchange.order_book_fetch('BTC/USD')['bids'] == []
+    # the updates still sent on the old channel are ignored
+    await replay(exchange, [17, [98, 1, 1]])
+    assert exchange.order_book_fetch('BTC/USD')['bids'] == []
+    await exchange.close()
+
+
+async def test_sequence():
+    exchange = create_exchange({'sequence': True})
+    assert exchange.connection_request_packets() == [{'event': 'conf', 'flags': 65536}]
+    await exchange.subscribe_order_book('BTC/USD')
+    # the sequence number is the last field of every message
+    await replay(exchange, subscribed, snapshot + [1], [17, 'hb', 2], update + [3])
+    assert exchange.order_book_fetch('BTC/USD')['bids'][0] == [100.5, 0.25]
+    assert not exchange.ws.closed
+    # a gap drops the message and closes the connection to resubscribe
+    await replay(exchange, [17, [100.7, 1, 1], 5])
+    assert exchange.validation_stats['sequenceGaps'] == 1
+    assert exchange.ws.closed
+    assert exchange.order_book_fetch('BTC/USD')['bids'][0] == [100.5, 0.25]
+    await exchange.close()
+
+
+async def test_rest():
+    validation = {'restInterval': 10, 'rest': Rest({'bids': [[99.5, 1]], 'asks': [[101.5, 1]]})}
+    exchange = create_exchange(validation)
+    await exchange.subscribe_order_book('BTC/USD')
+    sent(exchange)
+    await replay(exchange, subscribed, snapshot)
+    await asyncio.sleep(0.05)
+    # the books differ, but they do not cross
+    assert exchange.validation_stats['restChecks'] >= 2
+    assert exchange.validation_stats['restMismatches'] == 0
+    # the best bid of the snapshot is above the best ask of the book
+    validation['rest'].snapshot = {'bids': [[101.5, 1]], 'asks': [[102, 1]]}
+    await asyncio.sleep(0.05)
+    assert exchange.validation_stats['restMismatches'] == 2  # the book is invalidated until the next snapshot
+    assert exchange.validation_stats['resyncs'] == 1
+    assert sent(exchange) == [{'event': 'unsubscribe', 'chanId': 17}, exchange.subscriptions[('orderbooks', 'BTC/USD')]['request']]
+    await exchange.close()
+
+
+async def main():
+    await test_checksum()
+    await test_sequence()
+    await test_rest()
+    print('bitfinex validation tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
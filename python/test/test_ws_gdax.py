@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Replays recorded GDAX level2 frames from a local websocket server
+
+import asyncio
+import json
+import os
+import socket
+import sys
+
+from aiohttp import web
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async.ws as ccxt  # noqa: E402
+from ccxt.base.shared_order_book import SharedOrderBookReader  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+frames = [
+    {'type': 'snapshot', 'product_id': 'BTC-USD', 'bids': [['11200.00', '0.5'], ['11199.99', '1.2'], ['11199.50', '3']], 'asks': [['11200.01', '0.25'], ['11201.00', '2']]},
+    {'type': 'l2update', 'product_id': 'BTC-USD', 'changes': [['buy', '11200.00', '0.75']]},
+    {'type': 'heartbeat', 'product_id': 'BTC-USD', 'sequence': 1, 'last_trade_id': 1},
+    {'type': 'l2update', 'product_id': 'BTC-USD', 'changes': [['sell', '11200.01', '0'], ['sell', '11200.50', '1.5']]},
+    {'type': 'l2update', 'changes': [['buy', '11100.00', '1']]},  # no product_id, dropped
+    {'type': 'l2update', 'product_id': 'BTC-USD', 'changes': [['buy', '11100.00']]},  # malformed, dropped by the builder
+    {'type': 'l2update', 'product_id': 'BTC-USD', 'changes': [['buy', '11199.99', '0']]},
+    {'type': 'snapshot', 'product_id': 'ETH-USD', 'bids': [['850.10', '10']], 'asks': [['850.20', '4'], ['850.30', '6']]},
+    {'type': 'l2update', 'product_id': 'ETH-USD', 'changes': [['sell', '850.20', '0'], ['buy', '850.15', '1']]},
+]
+
+expected = {
+    'BTC/USD': {
+        'bids': [[11200.0, 0.75], [11199.5, 3.0]],
+        'asks': [[11200.5, 1.5], [11201.0, 2.0]],
+    },
+    'ETH/USD': {
+        'bids': [[850.15, 1.0], [850.1, 10.0]],
+        'asks': [[850.3, 6.0]],
+    },
+}
+
+# ------------------------------------------------------------------------------
+
+
+async def replay(request):
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for message in ws:
+        packet = json.loads(message.data)
+        assert packet['type'] == 'subscribe' and 'level2' in packet['channels']
+        products = packet['product_ids']
+        await ws.send_str(json.dumps({'type': 'subscriptions', 'channels': [{'name': 'level2', 'product_ids': products}]}))
+        await ws.send_str('not json')  # dropped by the event handler
+        for frame in frames:
+            if frame.get('product_id', products[0]) in products:
+                await ws.send_str(json.dumps(frame))
+    return ws
+
+
+async def main():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    app = web.Application()
+    app.router.add_get('/', replay)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.SockSite(runner, sock).start()
+
+    name = 'test-gdax-' + str(os.getpid())
+    exchange = ccxt.gdax({
+        'urls': {'ws': 'ws://127.0.0.1:' + str(sock.getsockname()[1]) + '/'},
+        'sharedOrderBooks': {'name': name, 'slots': 1},  # one slot for two symbols
+    })
+    # one status per applied snapshot or update
+    updates = {'BTC/USD': 4, 'ETH/USD': 2}
+    status_queue = asyncio.Queue()
+    for symbol in updates:
+        await exchange.subscribe_order_book(symbol, status_queue)
+    for i in range(sum(updates.values())):
+        await asyncio.wait_for(status_queue.get(), 5)
+
+    for symbol in expected:
+        order_book = await exchange.fetchOrderBook(symbol)
+        assert order_book['bids'] == expected[symbol]['bids'], order_book
+        assert order_book['asks'] == expected[symbol]['asks'], order_book
+    assert (await exchange.fetchOrderBook('BTC/USD', 1))['bids'] == [[11200.0, 0.75]]
+    # the malformed frames are logged and skipped without a reconnect
+    assert exchange.connection_status()['connects'] == 1
+    assert exchange.connection_status()['errors'] == 3
+    # the symbol without a slot is skipped, the other one is still shared
+    assert exchange.unshared_order_books == set(['ETH/USD'])
+    reader = SharedOrderBookReader(name)
+    assert reader.symbols() == ['BTC/USD']
+    assert reader.snapshot('BTC/USD')['bids'] == expected['BTC/USD']['bids']
+    reader.close()
+
+    await exchange.close()
+    await runner.cleanup()
+    print('gdax level2 replay ok')
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Drops the websocket connection of an exchange and checks that it reconnects and subscribes again
+
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async.ws as ccxt  # noqa: E402
+from ws_helpers import Server  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+
+def send_snapshots(connection, packet):
+    """Answers every subscription with a snapshot, every connection has another book"""
+    if packet['type'] == 'subscribe':
+        bid = str(100 + len(connection.server.connections))
+        for product_id in packet['product_ids']:
+            connection.push({'type': 'snapshot', 'product_id': product_id, 'bids': [[bid, '1']], 'asks': [['200', '1']]})
+
+
+def create_exchange(config=None):
+    server = Server(send_snapshots)
+    settings = {
+        'aiohttp_session': server,
+        'reconnectDelay': 10,
+        'heartbeatTimeout': 100,
+    }
+    settings.update(config or {})
+    exchange = ccxt.gdax(settings)
+    return exchange, server
+
+
+async def test_resubscribe():
+    exchange, server = create_exchange()
+    ready = await exchange.subscribe_order_book('BTC/USD')
+    await asyncio.wait_for(ready, 1)
+    assert exchange.order_book_fetch('BTC/USD')['bids'] == [[101.0, 1.0]]
+    # the connection drops, the book is cleared until the next snapshot
+    await server.connections[0].close()
+    while exchange.connection['connected']:
+        await asyncio.sleep(0)
+    assert not exchange.subscriptions[('orderbooks', 'BTC/USD')]['ready'].done()
+    await asyncio.wait_for(exchange.subscriptions[('orderbooks', 'BTC/USD')]['ready'], 1)
+    assert exchange.order_book_fetch('BTC/USD')['bids'] == [[102.0, 1.0]]
+    assert len(server.connections) == 2
+    assert [packet['product_ids'] for packet in server.sent] == [['BTC-USD'], ['BTC-USD']]
+    status = exchange.connection_status()
+    assert (status['connected'], status['connects'], status['reconnects']) == (True, 2, 1)
+    await exchange.close()
+
+
+async def test_heartbeat():
+    exchange, server = create_exchange()
+    # a connection without subscriptions is not expected to send anything
+    await asyncio.sleep(0.25)
+    assert exchange.connection['connects'] == 1
+    # a subscription that falls silent reconnects after the heartbeat timeout
+    await asyncio.wait_for(await exchange.subscribe_order_book('BTC/USD'), 1)
+    await asyncio.sleep(0.25)
+    assert exchange.connection['reconnects'] >= 1
+    assert isinstance(exchange.connection['lastError'], asyncio.TimeoutError)
+    await exchange.close()
+
+
+async def test_errors_are_quiet():
+    exchange, server = create_exchange()
+    await asyncio.sleep(0.01)
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr), contextlib.redirect_stdout(stderr):
+        server.connections[0].push('not json')
+        await asyncio.sleep(0.01)
+    # counted, but only printed in verbose mode
+    assert exchange.connection['errors'] == 1
+    assert stderr.getvalue() == ''
+    exchange.verbose = True
+    with contextlib.redirect_stdout(stderr):
+        server.connections[0].push('not json')
+        await asyncio.sleep(0.01)
+    assert 'event handler error' in stderr.getvalue()
+    assert exchange.connection['connects'] == 1  # the connection stays up
+    await exchange.close()
+
+
+async def test_unshared_order_book_is_quiet():
+    name = 'test-reconnect-' + str(os.getpid())
+    exchange, server = create_exchange({'sharedOrderBooks': {'name': name, 'slots': 1}})
+    output = io.StringIO()
+    with contextlib.redirect_stderr(output), contextlib.redirect_stdout(output):
+        for symbol in ('BTC/USD', 'ETH/USD'):
+            await asyncio.wait_for(await exchange.subscribe_order_book(symbol), 1)
+    # the second book does not fit in the shared memory, it is only kept in this process
+    assert exchange.unshared_order_books == set(['ETH/USD'])
+    assert output.getvalue() == ''
+    assert exchange.order_book_fetch('ETH/USD')['bids'] == [[101.0, 1.0]]
+    await exchange.close()
+
+
+async def test_subscribe_latency():
+    exchange, server = create_exchange()
+    assert exchange.subscribe_latency_stats()['count'] == 0
+
+    def send_snapshots_later(connection, packet):
+        # the first update of every subscription comes 50 milliseconds later
+        asyncio.get_event_loop().call_later(0.05, send_snapshots, connection, packet)
+
+    server.on_send = send_snapshots_later
+    for symbol in ('BTC/USD', 'ETH/USD'):
+        await asyncio.wait_for(await exchange.subscribe_order_book(symbol), 1)
+    stats = exchange.subscribe_latency_stats()
+    assert stats['count'] == 2
+    assert 50 <= stats['min'] <= stats['p50'] <= stats['p95'] <= stats['p99'] == stats['max'] < 1000
+    assert sorted(exchange.subscribe_latency) == [('orderbooks', 'BTC/USD'), ('orderbooks', 'ETH/USD')]
+    # the resubscriptions after a reconnect are measured too
+    await server.connections[0].close()
+    while exchange.connection['reconnects'] == 0:
+        await asyncio.sleep(0)
+    await asyncio.wait_for(exchange.subscriptions[('orderbooks', 'ETH/USD')]['ready'], 1)
+    await asyncio.wait_for(exchange.subscriptions[('orderbooks', 'BTC/USD')]['ready'], 1)
+    assert exchange.subscribe_latency_stats()['count'] == 4
+    await exchange.close()
+
+
+def test_percentile():
+    percentile = ccxt.gdax.percentile
+    samples = list(range(1, 101))
+    assert [percentile(samples, 50), percentile(samples, 95), percentile(samples, 99)] == [50, 95, 99]
+    assert [percentile([7], 50), percentile([7], 99)] == [7, 7]
+    # the bound holds for the given share of the samples, at least
+    assert [percentile([1, 2, 3], 50), percentile([1, 2, 3], 95)] == [2, 3]
+
+
+async def main():
+    await test_resubscribe()
+    await test_heartbeat()
+    await test_errors_are_quiet()
+    await test_unshared_order_book_is_quiet()
+    await test_subscribe_latency()
+    test_percentile()
+    print('reconnect tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Replays recorded Bitfinex v2 ticker and trades frames through the streams of the exchange
+
+import asyncio
+import os
+import sys
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt.async.ws as ccxt  # noqa: E402
+from ws_helpers import Server  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+channels = {
+    'ticker': 5,
+    'trades': 6,
+}
+
+frames = {
+    # [bid, bidSize, ask, askSize, dailyChange, dailyChangePerc, lastPrice, volume, high, low]
+    'ticker': [5, [11200.5, 3.2, 11201, 1.5, -150, -0.0132, 11200.6, 12000.25, 11500, 11000]],
+    # [id, timestamp, amount, price], the latest first
+    'trades': [6, [[402, 1518000001000, -0.5, 11200], [401, 1518000000000, 0.25, 11201]]],
+}
+
+
+def send_frames(connection, packet):
+    """Confirms every subscription and sends its snapshot"""
+    if packet.get('event') == 'subscribe':
+        channel = packet['channel']
+        connection.push({'event': 'subscribed', 'channel': channel, 'chanId': channels[channel], 'symbol': packet['symbol'], 'pair': packet['symbol'][1:]})
+        connection.push(frames[channel])
+
+
+async def create_exchange(config=None):
+    exchange = ccxt.bitfinex(dict({'aiohttp_session': Server(send_frames)}, **(config or {})))
+    while not exchange.connection['connected']:
+        await asyncio.sleep(0)
+    return exchange, exchange.aiohttp_session.connections[0]
+
+
+async def test_tickers():
+    exchange, connection = await create_exchange()
+    stream = exchange.stream('tickers', 'BTC/USD')
+    ticker = await asyncio.wait_for(stream.__anext__(), 1)
+    assert exchange.omit(ticker, ['timestamp', 'datetime', 'info']) == {
+        'symbol': 'BTC/USD',
+        'high': 11500,
+        'low': 11000,
+        'bid': 11200.5,
+        'ask': 11201,
+        'vwap': None,
+        'open': 11350.6,
+        'close': None,
+        'first': None,
+        'last': 11200.6,
+        'change': -150,
+        'percentage': -1.32,
+        'average': 11200.75,
+        'baseVolume': 12000.25,
+        'quoteVolume': None,
+    }
+    connection.push([5, 'hb'])  # no update
+    connection.push([5, [11210, 1, 11211, 2, -140, -0.0123, 11210.5, 12001, 11500, 11000]])
+    ticker = await asyncio.wait_for(stream.__anext__(), 1)
+    assert (ticker['bid'], ticker['last']) == (11210, 11210.5)
+    assert (await exchange.fetchTicker('BTC/USD')) is ticker
+    stream.close()
+    await exchange.close()
+
+
+async def test_trades():
+    exchange, connection = await create_exchange({'tradesLimit': 3})
+    stream = exchange.stream('trades', 'BTC/USD')
+    # one trade per iteration, the oldest first
+    first = await asyncio.wait_for(stream.__anext__(), 1)
+    second = await asyncio.wait_for(stream.__anext__(), 1)
+    assert exchange.omit(first, 'info') == {
+        'id': '401',
+        'timestamp': 1518000000000,
+        'datetime': '2018-02-07T10:40:00.000Z',
+        'symbol': 'BTC/USD',
+        'type': None,
+        'order': None,
+        'side': 'buy',
+        'price': 11201,
+        'amount': 0.25,
+        'cost': 2800.25,
+        'fee': None,
+    }
+    assert (second['id'], second['side'], second['amount']) == ('402', 'sell', 0.5)
+    # the 'tu' message repeats the 'te' one
+    connection.push([6, 'te', [403, 1518000002000, 1, 11202]])
+    connection.push([6, 'tu', [403, 1518000002000, 1, 11202]])
+    connection.push([6, 'te', [404, 1518000003000, -2, 11199]])
+    trades = [await asyncio.wait_for(stream.__anext__(), 1) for i in range(2)]
+    assert [trade['id'] for trade in trades] == ['403', '404']
+    await asyncio.sleep(0.01)
+    assert stream.queue.qsize() == 0
+    # the exchange keeps the last tradesLimit trades
+    trades = await exchange.fetchTrades('BTC/USD')
+    assert [trade['id'] for trade in trades] == ['402', '403', '404']
+    trades = await exchange.fetchTrades('BTC/USD', since=1518000002000, limit=1)
+    assert [trade['id'] for trade in trades] == ['404']
+    stream.close()
+    await exchange.close()
+
+
+async def main():
+    await test_tickers()
+    await test_trades()
+    print('stream tests passed')
+
+
+asyncio.get_event_loop().run_until_complete(main())
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""Stand-ins of a websocket server shared by the tests of the websocket exchanges"""
+
+import asyncio
+import collections
+import json
+
+import aiohttp
+
+# ------------------------------------------------------------------------------
+
+Message = collections.namedtuple('Message', ['type', 'data', 'extra'])
+
+
+def text_message(data):
+    return Message(aiohttp.WSMsgType.TEXT, data if isinstance(data, str) else json.dumps(data), None)
+
+
+class Connection(object):
+    """One websocket connection to a Server, the messages pushed by the test are received in order"""
+
+    def __init__(self, server):
+        self.server = server
+        self.inbox = asyncio.Queue()
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def send_json(self, packet):
+        self.server.sent.append(packet)
+        if self.server.on_send:
+            self.server.on_send(self, packet)
+
+    async def receive(self, timeout=None):
+        return await asyncio.wait_for(self.inbox.get(), timeout)
+
+    async def close(self):
+        self.closed = True
+        self.inbox.put_nowait(Message(aiohttp.WSMsgType.CLOSED, None, None))
+
+    def push(self, data):
+        self.inbox.put_nowait(text_message(data))
+
+
+class Server(object):
+    """Stands for the aiohttp session of a websocket exchange, on_send(connection, packet) answers the requests"""
+
+    def __init__(self, on_send=None):
+        self.on_send = on_send
+        self.sent = []
+        self.connections = []
+
+    def ws_connect(self, url):
+        connection = Connection(self)
+        self.connections.append(connection)
+        return connection
+
+    async def close(self):
+        pass